@@ -0,0 +1,72 @@
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+
+from adapters.repositories_interface.generic_repository_interface import (
+    T,
+    IGenericRepository,
+)
+from domain.models.transaction_columns import TransactionColumns
+from domain.utlis.search_index import SearchIndex
+
+class ColumnarRepository(IGenericRepository[T]):
+    """IGenericRepository backed by numpy column arrays instead of a list of models.
+
+    ``excluded`` / ``excluded_folded`` are the snapshot's precomputed exclusion-rule
+    masks used by ``clean`` (the folded one when matching accent-insensitively).
+    """
+
+    def __init__(
+        self,
+        columns: TransactionColumns,
+        search_index: SearchIndex,
+        excluded: np.ndarray,
+        excluded_folded: np.ndarray,
+    ):
+        self._columns = columns
+        self._search_index = search_index
+        self._excluded = excluded
+        self._excluded_folded = excluded_folded
+
+    def get(
+        self,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        order_by: Optional[bool] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        clean: Optional[bool] = None,
+        accent_insensitive: Optional[bool] = None,
+    ) -> List[T]:
+        # The date range is a contiguous slice; other filters only look inside it
+        lo, hi = self._columns.date_bounds(start_date, end_date)
+        indices = np.arange(lo, hi)
+        if clean:
+            excluded = self._excluded_folded if accent_insensitive else self._excluded
+            indices = indices[~excluded[indices]]
+
+        # Apply search filtering (query)
+        if query:
+            matches = self._search_index.search(
+                query, indices, accent_insensitive=bool(accent_insensitive)
+            )
+            indices = indices[matches]
+
+        if limit == -1:
+            limit = None
+        paged = offset is not None and limit is not None
+
+        # Apply sorting (stable, like list.sort, also when reversed); a page only
+        # needs its first offset + limit rows, which are selected without a full sort
+        if sort_by and len(indices) and self._columns.has_field(sort_by):
+            indices = self._columns.sorted_rows(
+                indices, sort_by, bool(order_by), limit=offset + limit if paged else None
+            )
+
+        # Apply pagination
+        if paged:
+            indices = indices[offset : offset + limit]
+        return self._columns.to_transactions(indices)
@@ -1,17 +1,34 @@
+import heapq
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Sequence
+
+import numpy as np
 
 from adapters.repositories_interface.generic_repository_interface import (
     T,
     IGenericRepository,
 )
-from domain.utlis.clean_data import clean_data, filter_transactions_by_date_range
-from domain.utlis.csv_reader import read_transactions_from_csv
+from domain.utlis.clean_data import clean_data, date_range_bounds
+from domain.utlis.search_index import SearchIndex
+
+# Heap selection beats sorting only when the page is a small part of the rows
+_HEAP_SELECT_RATIO = 8
 
 
 class GenericRepository(IGenericRepository[T]):
-    def __init__(self):
-        self._data = read_transactions_from_csv()
+    def __init__(
+        self,
+        data: Sequence[T],
+        search_index: SearchIndex,
+        excluded: Optional[np.ndarray] = None,
+        excluded_folded: Optional[np.ndarray] = None,
+    ):
+        # data is sorted newest first and shared read-only with other requests;
+        # excluded(_folded) are the precomputed clean_data masks over the same rows
+        self._data = data
+        self._search_index = search_index
+        self._excluded = excluded
+        self._excluded_folded = excluded_folded
 
     def get(
         self,
@@ -23,41 +40,45 @@ class GenericRepository(IGenericRepository[T]):
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         clean: Optional[bool] = None,
+        accent_insensitive: Optional[bool] = None,
     ) -> List[T]:
-        if clean:
-            self._data = clean_data(self._data)
-        filtered_data = self._data
-        filtered_data = filter_transactions_by_date_range(
+        lo, hi = date_range_bounds(
             _data=self._data,
             start_date=start_date,
             end_date=end_date,
         )
+        keep = np.ones(hi - lo, dtype=bool)
 
-        # Apply search filtering (query)
+        # Apply search filtering (query) through the prebuilt index
         if query:
-            query = query.lower()
-            filtered_data = [
-                item
-                for item in filtered_data
-                if any(
-                    hasattr(item, field)
-                    and getattr(item, field, "").lower().find(query) != -1
-                    for field in [
-                        "description",
-                        "category",
-                        "transaction_code",
-                        "counter_account",
-                    ]
-                )
-            ]
-
-        # Apply sorting
-        if sort_by and hasattr(filtered_data[0], sort_by):
-            filtered_data.sort(key=lambda x: getattr(x, sort_by), reverse=order_by)
+            keep &= self._search_index.search(
+                query, slice(lo, hi), accent_insensitive=bool(accent_insensitive)
+            )
+
+        excluded = self._excluded_folded if accent_insensitive else self._excluded
+        if clean and excluded is not None:
+            keep &= ~excluded[lo:hi]
+        filtered_data = [self._data[lo + i] for i in np.flatnonzero(keep)]
+
+        if clean and excluded is None:
+            filtered_data = clean_data(filtered_data, accent_insensitive=bool(accent_insensitive))
 
-        # Apply pagination
         if limit == -1:
             limit = None
+
+        # Apply sorting; a small page is selected with a heap instead of a full sort
+        # (nlargest / nsmallest return the same rows as the stable sort)
+        if sort_by and hasattr(filtered_data[0], sort_by):
+            key = lambda x: getattr(x, sort_by)
+            if offset is not None and limit is not None and (
+                offset + limit
+            ) * _HEAP_SELECT_RATIO < len(filtered_data):
+                select = heapq.nlargest if order_by else heapq.nsmallest
+                filtered_data = select(offset + limit, filtered_data, key=key)
+            else:
+                filtered_data.sort(key=key, reverse=order_by)
+
+        # Apply pagination
         if offset is not None and limit is not None:
             return filtered_data[offset : offset + limit]
         return filtered_data
@@ -0,0 +1,336 @@
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from adapters.repositories_interface.generic_repository_interface import (
+    IGenericRepository,
+)
+from domain.models.transaction import Transaction
+from domain.utlis.clean_data import EXCLUSION_RULES, sort_newest_first
+from domain.utlis.csv_reader import (
+    _FILE_PATH,
+    build_transactions,
+    fingerprint_matches,
+    read_data_cached,
+    source_fingerprint,
+)
+from domain.utlis.text_folding import fold_text
+
+logger = logging.getLogger("uvicorn")
+
+_COLUMNS = (
+    "transaction_date",
+    "description",
+    "effective_date",
+    "debit",
+    "credit",
+    "balance",
+    "counter_account",
+    "category",
+    "transaction_code",
+)
+_SEARCH_COLUMNS = ("description", "category", "transaction_code", "counter_account")
+_FOLDED_COLUMNS = tuple(f"{column}_folded" for column in _SEARCH_COLUMNS)
+_TRIGRAM = 3
+
+# Stored in PRAGMA user_version; older database files are imported again
+_SCHEMA_VERSION = 3
+
+# ``id`` is the newest-first position of the row, so "ORDER BY <column>, id"
+# reproduces the stable sort of the in-memory repositories. The *_folded shadow
+# columns hold fold_text() of the text columns for accent-insensitive queries.
+_SCHEMA = """
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY,
+    transaction_date TEXT NOT NULL,
+    description TEXT NOT NULL,
+    effective_date TEXT NOT NULL,
+    debit REAL NOT NULL,
+    credit REAL NOT NULL,
+    balance REAL NOT NULL,
+    counter_account TEXT NOT NULL,
+    category TEXT NOT NULL,
+    transaction_code TEXT NOT NULL,
+    description_folded TEXT NOT NULL,
+    category_folded TEXT NOT NULL,
+    transaction_code_folded TEXT NOT NULL,
+    counter_account_folded TEXT NOT NULL
+);
+CREATE TABLE source (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX idx_transactions_date ON transactions (transaction_date);
+CREATE INDEX idx_transactions_category ON transactions (category);
+CREATE INDEX idx_transactions_counter_account ON transactions (counter_account);
+CREATE VIRTUAL TABLE transactions_fts USING fts5 (
+    description,
+    category,
+    transaction_code,
+    counter_account,
+    content = 'transactions',
+    content_rowid = 'id',
+    tokenize = 'trigram'
+);
+CREATE VIRTUAL TABLE transactions_folded_fts USING fts5 (
+    description_folded,
+    category_folded,
+    transaction_code_folded,
+    counter_account_folded,
+    content = 'transactions',
+    content_rowid = 'id',
+    tokenize = 'trigram'
+);
+"""
+
+_connections = threading.local()
+
+
+def import_transactions(
+    transactions: Iterable[Transaction],
+    db_path: str,
+    load_errors: Sequence[Dict[str, Any]] = (),
+    fingerprint: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Writes a fresh database and atomically replaces ``db_path`` with it.
+
+    ``load_errors`` (the rows rejected while parsing the export) are stored
+    with the data so workers reading the database can report them, and
+    ``fingerprint`` (see source_fingerprint) records which export it came from.
+    """
+    rows = list(transactions)
+    sort_newest_first(rows)
+    temp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    connection = sqlite3.connect(temp_path)
+    try:
+        with connection:
+            connection.executescript(_SCHEMA)
+            connection.executemany(
+                f"INSERT INTO transactions (id, {', '.join(_COLUMNS + _FOLDED_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(_COLUMNS) + len(_FOLDED_COLUMNS) + 1))})",
+                (
+                    (
+                        position,
+                        *(_to_sql(getattr(tx, column)) for column in _COLUMNS),
+                        *(fold_text(getattr(tx, column)) for column in _SEARCH_COLUMNS),
+                    )
+                    for position, tx in enumerate(rows)
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO source (key, value) VALUES (?, ?)",
+                [
+                    ("load_errors", json.dumps(list(load_errors), default=str)),
+                    ("fingerprint", json.dumps(fingerprint)),
+                ],
+            )
+            for fts in ("transactions_fts", "transactions_folded_fts"):
+                connection.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+            connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        connection.close()
+        os.replace(temp_path, db_path)
+    finally:
+        connection.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    logger.info("💾 Imported %d transactions into %s", len(rows), db_path)
+    return len(rows)
+
+
+def import_excel(file_path: str, db_path: str) -> int:
+    """Imports a bank export in the Excel format read by read_data_excel."""
+    # Taken before parsing, so a file replaced mid-import is seen as stale next time
+    fingerprint = source_fingerprint(file_path)
+    transactions, errors = build_transactions(read_data_cached(file_path))
+    if errors:
+        logger.error("🚨 Skipped %d invalid rows while importing %s", len(errors), file_path)
+    return import_transactions(transactions, db_path, errors, fingerprint)
+
+
+def _to_sql(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def database_is_current(db_path: str, source_path: Optional[str] = None) -> bool:
+    """True when ``db_path`` exists and was written with the current schema.
+
+    With ``source_path`` the database must also have been imported from that
+    file's current contents (same size, mtime and sha256), so a replacement
+    export is picked up even when its mtime is older than the database.
+    """
+    if not os.path.exists(db_path):
+        return False
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            return False
+        (stored,) = connection.execute(
+            "SELECT value FROM source WHERE key = 'fingerprint'"
+        ).fetchone()
+    finally:
+        connection.close()
+    return source_path is None or fingerprint_matches(json.loads(stored), source_path)
+
+
+def _to_transaction(row: Sequence[Any]) -> Transaction:
+    return Transaction.model_construct(
+        transaction_date=date.fromisoformat(row[0]),
+        description=row[1],
+        effective_date=date.fromisoformat(row[2]),
+        debit=row[3],
+        credit=row[4],
+        balance=row[5],
+        counter_account=row[6],
+        category=row[7],
+        transaction_code=row[8],
+    )
+
+
+def read_transactions(db_path: str) -> Tuple[List[Transaction], List[Dict[str, Any]]]:
+    """Every imported transaction (newest first) and the import's rejected-row report.
+
+    Lets worker processes build their snapshot from the shared database
+    instead of parsing the Excel export again. The snapshot still holds every
+    row in each worker's memory.
+    """
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM transactions ORDER BY id"
+        ).fetchall()
+        (errors,) = connection.execute(
+            "SELECT value FROM source WHERE key = 'load_errors'"
+        ).fetchone()
+    finally:
+        connection.close()
+    return [_to_transaction(row) for row in rows], json.loads(errors)
+
+
+def _connect(db_path: str, generation: Tuple[int, int]) -> sqlite3.Connection:
+    """Read-only connection, one per thread and database file.
+
+    ``generation`` identifies the file version; after an import has replaced the
+    file the thread's old connection is closed and a new one is opened.
+    """
+    cache = getattr(_connections, "by_path", None)
+    if cache is None:
+        cache = _connections.by_path = {}
+    cached = cache.get(db_path)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    connection.create_function("py_lower", 1, str.lower, deterministic=True)
+    for column, pattern in EXCLUSION_RULES.patterns.items():
+        connection.create_function(
+            f"excluded_{column}",
+            1,
+            lambda text, pattern=pattern: pattern.search(text.lower()) is not None,
+            deterministic=True,
+        )
+    # Called with the *_folded shadow column, which is already normalized
+    for column, pattern in EXCLUSION_RULES.folded_patterns.items():
+        connection.create_function(
+            f"excluded_folded_{column}",
+            1,
+            lambda text, pattern=pattern: pattern.search(text) is not None,
+            deterministic=True,
+        )
+    cache[db_path] = (generation, connection)
+    return connection
+
+
+class SqliteTransactionRepository(IGenericRepository[Transaction]):
+    """IGenericRepository that pushes filtering, sorting and paging into SQLite.
+
+    The database file is shared by every worker process; it is imported from
+    the Excel export the first time it is needed. Only the list/search queries
+    go through it: the analytics endpoints still read the worker's in-memory
+    DatasetSnapshot, which is built from all rows of the same file.
+    """
+
+    def __init__(self, db_path: str, source_path: str = _FILE_PATH):
+        if not database_is_current(db_path):
+            import_excel(source_path, db_path)
+        self._db_path = db_path
+        stat = os.stat(db_path)
+        self._generation = (stat.st_ino, stat.st_mtime_ns)
+
+    def get(
+        self,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        order_by: Optional[bool] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        clean: Optional[bool] = None,
+        accent_insensitive: Optional[bool] = None,
+    ) -> List[Transaction]:
+        conditions, params = [], []
+        if start_date is not None:
+            conditions.append("transaction_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append("transaction_date <= ?")
+            params.append(end_date.isoformat())
+
+        # Apply search filtering (query): FTS5 trigram candidates, then the exact check
+        if query:
+            if accent_insensitive:
+                query, fts = fold_text(query), "transactions_folded_fts"
+                checks = [f"instr({column}, ?) > 0" for column in _FOLDED_COLUMNS]
+            else:
+                query, fts = query.lower(), "transactions_fts"
+                checks = [f"instr(py_lower({column}), ?) > 0" for column in _SEARCH_COLUMNS]
+            if len(query) >= _TRIGRAM:
+                conditions.append(f"id IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)")
+                params.append('"{}"'.format(query.replace('"', '""')))
+            conditions.append("(" + " OR ".join(checks) + ")")
+            params.extend([query] * len(checks))
+
+        # Exclusion rules: one compiled matcher per column
+        if clean:
+            for column in EXCLUSION_RULES.patterns:
+                if accent_insensitive:
+                    conditions.append(f"NOT excluded_folded_{column}({column}_folded)")
+                else:
+                    conditions.append(f"NOT excluded_{column}({column})")
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM transactions"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        # Apply sorting; ties keep the newest-first order like list.sort
+        if sort_by in _COLUMNS:
+            sql += f" ORDER BY {sort_by} {'DESC' if order_by else 'ASC'}, id"
+        else:
+            sql += " ORDER BY id"
+
+        # Apply pagination
+        if limit == -1:
+            limit = None
+        if offset is not None and limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+
+        rows = _connect(self._db_path, self._generation).execute(sql, params).fetchall()
+        return [_to_transaction(row) for row in rows]
+
+
+if __name__ == "__main__":
+    # python -m adapters.repositories.sqlite_repository <data.xlsx> <transactions.db>
+    logging.basicConfig(level=logging.INFO)
+    import_excel(sys.argv[1], sys.argv[2])
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List
 
+from adapters.repositories.columnar_repository import ColumnarRepository
 from adapters.repositories.generic_repository import GenericRepository
 from domain.models.transaction import Transaction
 
@@ -10,3 +11,7 @@ class TransactionRepository(GenericRepository[Transaction]):
         self, start_date: datetime, end_date: datetime
     ) -> List[Transaction]:
         return self.filter(lambda tx: start_date <= tx.transaction_date <= end_date)
+
+
+class ColumnarTransactionRepository(ColumnarRepository[Transaction]):
+    pass
@@ -17,5 +17,6 @@ class IGenericRepository(ABC, Generic[T]):
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         clean: Optional[bool] = None,
+        accent_insensitive: Optional[bool] = None,
     ) -> List[T]:
         pass
@@ -0,0 +1,75 @@
+"""Compares the legacy iterrows ingestion with build_transactions.
+
+Run from the api directory:
+
+    python -m benchmarks.transaction_ingest_benchmark --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from domain.models.transaction import Transaction
+from domain.utlis.csv_reader import build_transactions
+
+
+def make_frame(rows: int, invalid_every: int = 0, seed: int = 0) -> pd.DataFrame:
+    """Synthetic frame shaped like the output of read_data_excel."""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+        rng.integers(0, 5 * 365, rows), unit="D"
+    )
+    df = pd.DataFrame(
+        {
+            "transaction_date": dates,
+            "effective_date": dates,
+            "description": rng.choice(["xăng", "tiền nhà", "shopee", "cafe máy"], rows),
+            "debit": rng.integers(0, 500_000, rows).astype(float),
+            "credit": rng.integers(0, 500_000, rows).astype(float),
+            "balance": rng.integers(0, 50_000_000, rows),
+            "counter_account": rng.choice(["coopmart", "VPS", "fpt telecom", ""], rows),
+            "category": rng.choice(["food", "rent", "saving", ""], rows),
+            "transaction_code": [f"TC{i}" for i in range(rows)],
+        }
+    )
+    if invalid_every:
+        df["description"] = df["description"].astype(object)
+        df.loc[:: invalid_every, "description"] = None
+    return df
+
+
+def build_transactions_iterrows(df: pd.DataFrame):
+    """The per-row iterrows path the loader used before build_transactions."""
+    transactions, errors = [], []
+    for position, (_, row) in enumerate(df.iterrows()):
+        try:
+            transactions.append(Transaction(**row.to_dict()))
+        except Exception as e:
+            errors.append({"row": position, "error": str(e)})
+    return transactions, errors
+
+
+def _time(label: str, func, df: pd.DataFrame) -> float:
+    start = time.perf_counter()
+    transactions, errors = func(df)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.3f}s  {len(transactions):>8} valid  {len(errors):>6} rejected")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--invalid-every", type=int, default=1_000)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.invalid_every)
+    print(f"{args.rows} rows, every {args.invalid_every}th row invalid")
+    legacy = _time("iterrows", build_transactions_iterrows, df)
+    bulk = _time("bulk", build_transactions, df)
+    print(f"speed-up: {legacy / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
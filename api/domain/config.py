@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +9,22 @@ class Settings(BaseSettings):
     environment: str = Field(default="development", env="ENVIRONMENT")
     debug: bool = Field(default=True, env="DEBUG")
 
+    # Bank export (.xlsx) loaded at startup; defaults to csv_reader._FILE_PATH
+    data_file_path: Optional[str] = Field(default=None, env="DATA_FILE_PATH")
+    # Seconds between checks of data_file_path for changes; 0 disables hot reload
+    reload_interval_seconds: float = Field(default=5.0, env="RELOAD_INTERVAL_SECONDS")
+    # Versioned expense category rules, watched like data_file_path; defaults to
+    # domain/rules/category_rules.json
+    category_rules_path: Optional[str] = Field(default=None, env="CATEGORY_RULES_PATH")
+
+    # "memory" keeps a list of Transaction models, "columnar" uses numpy arrays,
+    # "sqlite" serves the list/search endpoints from the database file at
+    # sqlite_path. The export is parsed once into that file for all workers, but
+    # every worker still reads all of its rows into an in-memory snapshot for the
+    # analytics endpoints, so memory per worker is the same as with "memory".
+    repository_backend: str = Field(default="memory", env="REPOSITORY_BACKEND")
+    sqlite_path: str = Field(default="transactions.db", env="SQLITE_PATH")
+
     db_host: str = Field(env="DB_HOST")
     db_port: int = Field(env="DB_PORT")
     db_name: str = Field(env="DB_NAME")
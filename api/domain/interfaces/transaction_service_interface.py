@@ -1,9 +1,25 @@
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 from abc import ABC, abstractmethod
 from datetime import date
 from typing import Any, Dict
 
 from domain.models.transaction import Transaction
+from domain.utlis.periods import DEFAULT_ANCHOR_DAY
+
+# Sections of the dashboard bundle, in response order
+DASHBOARD_SECTIONS = (
+    "overview",
+    "summary",
+    "income_expenditure",
+    "balance_trends",
+    "top_debits",
+    "latest",
+    "category_top",
+    "expense_tree",
+)
+
+# Longest range (in days) of the daily rolling series; three years of output days
+ROLLING_MAX_DAYS = 3 * 366
 
 
 class ITransactionService(ABC):
@@ -18,6 +34,7 @@ class ITransactionService(ABC):
         start_date: Optional[date],
         end_date: Optional[date],
         clean: bool,
+        accent_insensitive: bool = False,
     ) -> list[Transaction]:
         pass
 
@@ -26,8 +43,13 @@ class ITransactionService(ABC):
         self,
         start_date: Optional[date],
         end_date: Optional[date],
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
     ) -> List[Dict]:
-        """Analyzes income and expenditure for a given range of years and months."""
+        """Analyzes income and expenditure for a given range of years and months.
+
+        With ``period`` (month, cycle, week, quarter, year) the totals are grouped per period.
+        """
         pass
 
     @abstractmethod
@@ -35,6 +57,7 @@ class ITransactionService(ABC):
         self,
         start_date: Optional[date],
         end_date: Optional[date],
+        accent_insensitive: bool = False,
     ) -> List[Transaction]:
         pass
 
@@ -43,11 +66,18 @@ class ITransactionService(ABC):
         self,
         start_date: Optional[date],
         end_date: Optional[date],
+        accent_insensitive: bool = False,
     ) -> List[Transaction]:
         pass
 
     @abstractmethod
-    def generate_overview_section(self) -> Dict[str, Any]:
+    def generate_overview_section(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+    ) -> Dict[str, Any]:
         pass
 
     @abstractmethod
@@ -61,8 +91,14 @@ class ITransactionService(ABC):
         offset: int,
         start_date: Optional[date],
         end_date: Optional[date],
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+        max_points: Optional[int] = None,
     ) -> List[Dict[str, any]]:
-        """Computes the last balance for each day within the date range and returns structured data."""
+        """Computes the last balance for each day within the date range and returns structured data.
+
+        ``max_points`` caps the number of returned points by downsampling the series.
+        """
         pass
 
     @abstractmethod
@@ -72,5 +108,78 @@ class ITransactionService(ABC):
         start_date: Optional[date],
         end_date: Optional[date],
         limit: int = -1,
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
     ) -> List[Dict[str, Any]]:
         pass
+
+    @abstractmethod
+    def expense_treemap(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        by_month: bool = False,
+        top_n: int = 10,
+        clean: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Debits by expense category, counter account and optionally month, as a tree."""
+        pass
+
+    @abstractmethod
+    def dashboard(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        sections: Optional[List[str]] = None,
+        top_n: int = 4,
+        categories: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Several dashboard sections for one date range in a single call."""
+        pass
+
+    @abstractmethod
+    def rolling(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        windows: Sequence[int] = (7, 30, 90),
+        measure: str = "debit",
+        by_category: bool = False,
+    ) -> Dict[str, Any]:
+        """Moving sum, mean and standard deviation per day for each window."""
+        pass
+
+    @abstractmethod
+    def aggregate(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        group_by: Sequence[str] = (),
+        measures: Sequence[Tuple[str, Optional[str]]] = (("count", None),),
+        query: Optional[str] = None,
+        clean: bool = False,
+        accent_insensitive: bool = False,
+        expense_categories: Sequence[str] = (),
+        counter_accounts: Sequence[str] = (),
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+        sort_by: Optional[str] = None,
+        limit: int = -1,
+    ) -> Dict[str, Any]:
+        """Measures per group of transactions, as columnar arrays."""
+        pass
+
+    @abstractmethod
+    def compare(
+        self,
+        group_by: Sequence[str] = ("expense_category",),
+        measures: Sequence[Tuple[str, Optional[str]]] = (("sum", "debit"),),
+        base: Optional[Tuple[date, date]] = None,
+        target: Optional[Tuple[date, date]] = None,
+        period: Optional[str] = None,
+        periods: int = 1,
+        end_date: Optional[date] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+        clean: bool = True,
+    ) -> Dict[str, Any]:
+        """Measures per group for consecutive periods with deltas and percentage changes."""
+        pass
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CategorizationRecord(BaseModel):
+    description: str = ""
+    counter_account: str = ""
+    category: Optional[str] = None
+
+
+class CategorizedRecord(CategorizationRecord):
+    expense_category: str
@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from domain.models.derived_columns import DerivedColumns
+from domain.models.monthly_rollup import MonthlyRollup
+from domain.models.prefix_sums import PrefixSums
+from domain.models.transaction import Transaction
+from domain.models.transaction_columns import TransactionColumns
+from domain.utlis.clean_data import EXPENSE_CATEGORIZER
+from domain.utlis.response_cache import ResponseCache
+from domain.utlis.rule_engine import ExpenseCategorizer
+from domain.utlis.search_index import SearchIndex
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """One immutable, versioned load of the transaction dataset and its indexes.
+
+    ``transactions`` and ``columns`` hold the same rows in the same
+    (newest-first) order, so row positions are shared by every index.
+    ``rollup`` is the monthly cube of the rows, ``prefix_sums`` answers range
+    totals and ``responses`` caches computed responses for this snapshot only.
+    """
+
+    version: int
+    loaded_at: datetime
+    source_path: str
+    transactions: Tuple[Transaction, ...]
+    columns: TransactionColumns
+    derived: DerivedColumns
+    rollup: MonthlyRollup
+    prefix_sums: PrefixSums
+    search_index: SearchIndex
+    load_errors: Tuple[Dict[str, Any], ...] = ()
+    responses: ResponseCache = field(default_factory=ResponseCache, compare=False, repr=False)
+
+    @property
+    def rules_version(self) -> Any:
+        """Version of the category rule file the expense categories were built with."""
+        return self.derived.categorizer.version
+
+    @classmethod
+    def build(
+        cls,
+        transactions: Iterable[Transaction],
+        version: int,
+        source_path: str,
+        load_errors: Iterable[Dict[str, Any]] = (),
+        categorizer: ExpenseCategorizer = EXPENSE_CATEGORIZER,
+        previous: Optional["DatasetSnapshot"] = None,
+    ) -> "DatasetSnapshot":
+        """Builds the snapshot; when the rows only append to ``previous`` its cube is extended."""
+        rows = sorted(transactions, key=lambda tx: tx.transaction_date, reverse=True)
+        columns = TransactionColumns.from_transactions(rows)
+        derived = DerivedColumns(columns, categorizer=categorizer)
+        added = None if previous is None else columns.appended_count(previous.columns)
+        if added is None:
+            rollup = MonthlyRollup.from_rows(columns)
+        else:
+            rollup = previous.rollup.merged(MonthlyRollup.from_rows(columns, slice(0, added)))
+        return cls(
+            version=version,
+            loaded_at=datetime.now(),
+            source_path=source_path,
+            transactions=tuple(rows),
+            columns=columns,
+            derived=derived,
+            rollup=rollup,
+            prefix_sums=PrefixSums(columns, derived),
+            search_index=SearchIndex(columns.strings),
+            load_errors=tuple(load_errors),
+        )
+
+    def with_categorizer(self, categorizer: ExpenseCategorizer) -> "DatasetSnapshot":
+        """Same data with the expense categories rebuilt and an empty response cache.
+
+        The monthly cube does not depend on categories and is shared.
+        """
+        return replace(
+            self,
+            derived=self.derived.recategorized(categorizer),
+            responses=ResponseCache(),
+        )
@@ -0,0 +1,127 @@
+import copy
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from domain.models.transaction_columns import EncodedColumn, TransactionColumns
+from domain.utlis.clean_data import (
+    EXCLUSION_RULES,
+    EXPENSE_CATEGORIZER,
+    INVESTMENT_DESCRIPTION_KEYWORDS,
+    SAVING_DESCRIPTION_KEYWORDS,
+)
+from domain.utlis.rule_engine import ExclusionRules, ExpenseCategorizer
+from domain.utlis.text_folding import fold_text
+
+
+def _startswith_any(
+    column: EncodedColumn, prefixes: Sequence[str], folded: bool = False
+) -> np.ndarray:
+    """Rows starting with one of ``prefixes``: exactly, or on the folded table (see fold_text)."""
+    prefixes = tuple(fold_text(prefix) for prefix in prefixes) if folded else tuple(prefixes)
+    return column.mask_where(
+        lambda value: value.startswith(prefixes), lowered=False, folded=folded
+    )
+
+
+def _flow_mask(
+    strings: Mapping[str, EncodedColumn],
+    description_keywords: Sequence[str],
+    category_prefix: str,
+    folded: bool = False,
+) -> np.ndarray:
+    return _startswith_any(
+        strings["description"], description_keywords, folded
+    ) | _startswith_any(strings["category"], [category_prefix], folded)
+
+
+def _expense_categories(
+    accounts: EncodedColumn, categories: EncodedColumn, categorizer: ExpenseCategorizer
+) -> EncodedColumn:
+    """categorize_expense(counter_account, category) of every row, one call per distinct pair."""
+    width = len(categories.values)
+    pairs = accounts.codes.astype(np.int64) * width + categories.codes
+    distinct, inverse = np.unique(pairs, return_inverse=True)
+    labels = EncodedColumn.encode(
+        categorizer.categorize_many(
+            accounts.values[distinct // width].tolist(),
+            categories.values[distinct % width].tolist(),
+        )
+    )
+    return EncodedColumn(labels.codes[inverse.reshape(-1)], labels.values)
+
+
+class DerivedColumns:
+    """Read-only columns computed once per snapshot from the raw transaction columns.
+
+    - ``net_flow``: debit - credit, the balance shown for saving/investment rows
+    - ``effective_category``: category, or "saving"/"invest" when it is empty
+    - ``is_saving`` / ``is_investment``: rows moving money into savings/investments
+    - ``is_saving_folded`` / ``is_investment_folded``: the same, matched
+      ignoring case and accents
+    - ``excluded``: rows removed by the exclusion rules (evaluated on the stored category)
+    - ``excluded_folded``: the same, matched accent-insensitively
+    - ``is_clean``: rows kept by clean_data (evaluated on effective_category)
+    - ``expense_category``: categorize_expense(counter_account, category), encoded
+    """
+
+    def __init__(
+        self,
+        columns: TransactionColumns,
+        rules: ExclusionRules = EXCLUSION_RULES,
+        categorizer: ExpenseCategorizer = EXPENSE_CATEGORIZER,
+    ):
+        strings = columns.strings
+        self._strings = strings
+        self.categorizer = categorizer
+        self.net_flow = columns.amounts["debit"] - columns.amounts["credit"]
+        self.is_saving = _flow_mask(strings, SAVING_DESCRIPTION_KEYWORDS, "saving")
+        self.is_investment = _flow_mask(strings, INVESTMENT_DESCRIPTION_KEYWORDS, "invest")
+        self.is_saving_folded = _flow_mask(
+            strings, SAVING_DESCRIPTION_KEYWORDS, "saving", folded=True
+        )
+        self.is_investment_folded = _flow_mask(
+            strings, INVESTMENT_DESCRIPTION_KEYWORDS, "invest", folded=True
+        )
+
+        category = strings["category"]
+        fallback = np.where(
+            self.is_saving, "saving", np.where(self.is_investment, "invest", "")
+        ).astype(object)
+        self.effective_category = EncodedColumn.encode(
+            np.where(
+                category.mask_where(lambda value: value == "", lowered=False),
+                fallback,
+                category.values[category.codes],
+            )
+        )
+
+        self.excluded = rules.mask(strings)
+        self.excluded_folded = rules.mask(strings, accent_insensitive=True)
+        self.is_clean = ~rules.mask({**strings, "category": self.effective_category})
+        self.expense_category = _expense_categories(
+            strings["counter_account"], strings["category"], categorizer
+        )
+
+        for array in (
+            self.net_flow,
+            self.is_saving,
+            self.is_investment,
+            self.is_saving_folded,
+            self.is_investment_folded,
+            self.excluded,
+            self.excluded_folded,
+            self.is_clean,
+            self.expense_category.codes,
+        ):
+            array.setflags(write=False)
+
+    def recategorized(self, categorizer: ExpenseCategorizer) -> "DerivedColumns":
+        """Copy sharing every column except ``expense_category``, rebuilt with ``categorizer``."""
+        derived = copy.copy(self)
+        derived.categorizer = categorizer
+        derived.expense_category = _expense_categories(
+            self._strings["counter_account"], self._strings["category"], categorizer
+        )
+        derived.expense_category.codes.setflags(write=False)
+        return derived
@@ -0,0 +1,51 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from domain.models.derived_columns import DerivedColumns
+from domain.models.transaction_columns import TransactionColumns
+
+FLAGS = ("clean", "saving", "investment")
+MEASURES = ("credit", "debit", "net_flow", "count")
+
+
+class PrefixSums:
+    """Cumulative sums over the newest-first rows, one array per (flag, measure).
+
+    ``sums[flag, measure][i]`` is the total of the first ``i`` rows with that flag
+    set, so the total of any row slice (and a date range is always one, see
+    TransactionColumns.date_bounds) is the difference of two lookups.
+    """
+
+    def __init__(self, columns: TransactionColumns, derived: DerivedColumns):
+        masks = {
+            "clean": derived.is_clean,
+            "saving": derived.is_saving,
+            "investment": derived.is_investment,
+        }
+        values = {
+            "credit": columns.amounts["credit"],
+            "debit": columns.amounts["debit"],
+            "net_flow": derived.net_flow,
+            "count": np.ones(len(columns), dtype=np.float64),
+        }
+        self.sums: Dict[Tuple[str, str], np.ndarray] = {}
+        for flag, mask in masks.items():
+            for measure, column in values.items():
+                cumulative = np.zeros(len(columns) + 1, dtype=np.float64)
+                np.cumsum(np.where(mask, column, 0.0), out=cumulative[1:])
+                cumulative.setflags(write=False)
+                self.sums[flag, measure] = cumulative
+        self.clean_rows = np.flatnonzero(derived.is_clean)
+        self.clean_rows.setflags(write=False)
+
+    def total(self, flag: str, measure: str, rows: slice) -> float:
+        cumulative = self.sums[flag, measure]
+        return float(cumulative[rows.stop] - cumulative[rows.start])
+
+    def first_clean_row(self, rows: slice) -> Optional[int]:
+        """The first (newest) clean row of the slice, or None."""
+        position = int(np.searchsorted(self.clean_rows, rows.start))
+        if position < len(self.clean_rows) and self.clean_rows[position] < rows.stop:
+            return int(self.clean_rows[position])
+        return None
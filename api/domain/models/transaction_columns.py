@@ -0,0 +1,213 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from domain.models.transaction import Transaction
+from domain.utlis.text_folding import fold_text
+
+DATE_FIELDS = ("transaction_date", "effective_date")
+AMOUNT_FIELDS = ("debit", "credit", "balance")
+STRING_FIELDS = ("description", "counter_account", "category", "transaction_code")
+
+
+def _day_number(value: date) -> int:
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+
+class EncodedColumn:
+    """Dictionary-encoded string column: integer codes into a sorted value table.
+
+    ``lowered`` and ``folded`` (casefolded, accents stripped) are shadow tables
+    normalized once per distinct value, so filters never normalize per row.
+    """
+
+    def __init__(self, codes: np.ndarray, values: np.ndarray):
+        self.codes = codes
+        self.values = values
+        self.lowered = np.array([value.lower() for value in values], dtype=object)
+        self.folded = np.array([fold_text(value) for value in values], dtype=object)
+
+    @classmethod
+    def encode(cls, strings: Sequence[str]) -> "EncodedColumn":
+        codes, values = pd.factorize(pd.Series(strings, dtype=object), sort=True)
+        return cls(codes.astype(np.int32), np.asarray(values, dtype=object))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def mask_where(
+        self,
+        predicate,
+        rows: Union[slice, np.ndarray] = slice(None),
+        lowered: bool = True,
+        folded: bool = False,
+    ) -> np.ndarray:
+        """Evaluates predicate once per distinct value and broadcasts it to the rows.
+
+        The predicate sees the folded, lowered or raw value, in that order of precedence.
+        """
+        table = self.folded if folded else self.lowered if lowered else self.values
+        hits = np.fromiter((predicate(value) for value in table), dtype=bool, count=len(table))
+        return hits[self.codes[rows]]
+
+    def decode(self, indices: np.ndarray) -> List[str]:
+        return self.values[self.codes[indices]].tolist()
+
+
+class TransactionColumns:
+    """Read-only, column-oriented copy of a transaction dataset.
+
+    Dates are stored as ``datetime64[D]``, amounts as ``float64`` and text fields
+    as dictionary-encoded codes, so filters and sorts run as vectorized numpy
+    operations and ``Transaction`` objects are only built for returned rows.
+
+    Rows are kept sorted newest first by ``transaction_date`` (the order of the
+    bank export, ties keep their input order), so a date range is always a
+    contiguous ``[lo, hi)`` slice found by binary search.
+    """
+
+    def __init__(
+        self,
+        dates: Dict[str, np.ndarray],
+        amounts: Dict[str, np.ndarray],
+        strings: Dict[str, EncodedColumn],
+    ):
+        self.dates = dates
+        self.amounts = amounts
+        self.strings = strings
+        # Ascending search keys for the newest-first transaction dates
+        self._day_keys = -dates["transaction_date"].astype(np.int64)
+        # (field, descending) -> sort_rank, filled on first use
+        self._ranks: Dict[Tuple[str, bool], np.ndarray] = {}
+        for column in (*dates.values(), *amounts.values(), self._day_keys):
+            column.setflags(write=False)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionColumns":
+        rows = sorted(transactions, key=lambda tx: tx.transaction_date, reverse=True)
+        dates = {
+            field: np.array([getattr(tx, field) for tx in rows], dtype="datetime64[D]")
+            for field in DATE_FIELDS
+        }
+        amounts = {
+            field: np.array([getattr(tx, field) for tx in rows], dtype=np.float64)
+            for field in AMOUNT_FIELDS
+        }
+        strings = {
+            field: EncodedColumn.encode([getattr(tx, field) for tx in rows])
+            for field in STRING_FIELDS
+        }
+        return cls(dates, amounts, strings)
+
+    def __len__(self) -> int:
+        return len(self.amounts["debit"])
+
+    def has_field(self, field: str) -> bool:
+        return field in self.dates or field in self.amounts or field in self.strings
+
+    def sort_key(self, field: str) -> np.ndarray:
+        """Returns a numeric array whose ordering matches the ordering of ``field``."""
+        if field in self.dates:
+            return self.dates[field].astype(np.int64)
+        if field in self.amounts:
+            return self.amounts[field]
+        return self.strings[field].codes
+
+    def sort_rank(self, field: str, descending: bool = False) -> np.ndarray:
+        """Position of every row in a stable sort by ``field``, computed once per snapshot.
+
+        Ranks are unique, so ordering any subset of rows by rank reproduces the
+        stable sort of that subset (ties keep the newest-first row order).
+        """
+        rank = self._ranks.get((field, descending))
+        if rank is None:
+            key = self.sort_key(field)
+            order = np.argsort(-key if descending else key, kind="stable")
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            rank.setflags(write=False)
+            self._ranks[(field, descending)] = rank
+        return rank
+
+    def sorted_rows(
+        self,
+        indices: np.ndarray,
+        field: str,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> np.ndarray:
+        """``indices`` stably sorted by ``field``; only the first ``limit`` rows when given.
+
+        A limit below the number of rows selects them with argpartition in O(n)
+        and sorts only the selected rows.
+        """
+        rank = self.sort_rank(field, descending)[indices]
+        if limit is not None and limit < len(indices):
+            if limit <= 0:
+                return indices[:0]
+            top = np.argpartition(rank, limit - 1)[:limit]
+            return indices[top[np.argsort(rank[top])]]
+        return indices[np.argsort(rank)]
+
+    def date_bounds(
+        self, start_date: Optional[date], end_date: Optional[date]
+    ) -> Tuple[int, int]:
+        """Row slice ``[lo, hi)`` holding the transactions dated within the range (inclusive)."""
+        lo, hi = 0, len(self)
+        if end_date is not None:
+            lo = int(np.searchsorted(self._day_keys, -_day_number(end_date), side="left"))
+        if start_date is not None:
+            hi = int(np.searchsorted(self._day_keys, -_day_number(start_date), side="right"))
+        return lo, max(lo, hi)
+
+    def appended_count(self, previous: "TransactionColumns") -> Optional[int]:
+        """Number of rows added in front of ``previous`` when this data only appends to it.
+
+        Rows are newest first, so rows appended to an export come first and the
+        previous rows must match the tail exactly. Returns None otherwise.
+        """
+        added = len(self) - len(previous)
+        if added < 0:
+            return None
+        tail = slice(added, None)
+        same = all(
+            np.array_equal(self.dates[field][tail], previous.dates[field])
+            for field in DATE_FIELDS
+        ) and all(
+            np.array_equal(self.amounts[field][tail], previous.amounts[field])
+            for field in AMOUNT_FIELDS
+        ) and all(
+            np.array_equal(
+                self.strings[field].values[self.strings[field].codes[tail]],
+                previous.strings[field].values[previous.strings[field].codes],
+            )
+            for field in STRING_FIELDS
+        )
+        return added if same else None
+
+    def to_transactions(
+        self,
+        indices: np.ndarray,
+        replace: Optional[Dict[str, Union[np.ndarray, EncodedColumn]]] = None,
+    ) -> List[Transaction]:
+        """Materializes ``Transaction`` objects for the given row positions only.
+
+        ``replace`` maps a field to a full-length column (e.g. a derived one) read
+        instead of the stored column; the stored data itself is never modified.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        sources = {**self.dates, **self.amounts, **self.strings, **(replace or {})}
+        columns = {
+            field: (
+                column.decode(indices)
+                if isinstance(column, EncodedColumn)
+                else column[indices].tolist()
+            )
+            for field, column in sources.items()
+        }
+        return [
+            Transaction.model_construct(**dict(zip(columns, values)))
+            for values in zip(*columns.values())
+        ]
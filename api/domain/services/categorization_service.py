@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pydantic import TypeAdapter
+
+from domain.models.categorization import CategorizationRecord, CategorizedRecord
+from domain.utlis.rule_engine import ExpenseCategorizer
+
+# Records categorized per categorize_many call when streaming
+BATCH_SIZE = 1000
+
+_CATEGORIZED_LIST_ADAPTER = TypeAdapter(List[CategorizedRecord])
+
+
+class CategorizationService:
+    """Categorizes records that are not part of the loaded dataset.
+
+    Uses the same compiled rules as the dataset (categorize_expense semantics on
+    counter_account, or on description when the record has no counter_account).
+    Each request brings its own memo so outside data never stays cached.
+    """
+
+    def __init__(self, categorizer: ExpenseCategorizer):
+        self.categorizer = categorizer
+        self._memo: Dict[Tuple[Any, Any], Tuple[str, int]] = {}
+
+    @property
+    def rules_version(self) -> Any:
+        return self.categorizer.version
+
+    def categorize_batch(
+        self, records: Sequence[CategorizationRecord]
+    ) -> List[CategorizedRecord]:
+        """Categorizes ``records`` with one rule lookup per distinct (text, category) pair."""
+        pairs = [
+            (record.counter_account or record.description, record.category) for record in records
+        ]
+        distinct = list(dict.fromkeys(pairs))
+        labels = dict(
+            zip(
+                distinct,
+                self.categorizer.categorize_many(
+                    [text for text, _ in distinct],
+                    [category for _, category in distinct],
+                    memo=self._memo,
+                ),
+            )
+        )
+        # Validated as one list in pydantic-core, cheaper than model_construct per row
+        return _CATEGORIZED_LIST_ADAPTER.validate_python(
+            [
+                {
+                    "description": record.description,
+                    "counter_account": record.counter_account,
+                    "category": record.category,
+                    "expense_category": labels[pair],
+                }
+                for record, pair in zip(records, pairs)
+            ]
+        )
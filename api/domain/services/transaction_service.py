@@ -1,23 +1,149 @@
-from collections import defaultdict
-from datetime import date
+from datetime import date, timedelta
 import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 import logging
 
-from adapters.repositories.transaction_repository import TransactionRepository
+import numpy as np
+
+from adapters.repositories_interface.generic_repository_interface import (
+    IGenericRepository,
+)
+from domain.models.dataset_snapshot import DatasetSnapshot
+from domain.models.monthly_rollup import (
+    MEASURES,
+    month_end,
+    month_number,
+    month_start,
+    rows_month_totals,
+    split_months,
+)
+from domain.utlis.aggregation import aggregate, group_ids, measure_names
+from domain.utlis.downsampling import lttb_indices
+from domain.utlis.periods import (
+    DEFAULT_ANCHOR_DAY,
+    PERIODS,
+    period_ids,
+    period_info,
+    period_label,
+)
+from domain.utlis.rolling import rolling_stats
 from domain.models.transaction import Transaction
-from domain.utlis.clean_data import (
-    categorize_expense,
-    clean_data,
-    filter_transactions,
+from domain.interfaces.transaction_service_interface import (
+    DASHBOARD_SECTIONS,
+    ROLLING_MAX_DAYS,
 )
 
 logger = logging.getLogger("uvicorn")
 
+# Calendar period grains that are whole numbers of months
+_MONTHS_PER_PERIOD = {"month": 1, "quarter": 3, "year": 12}
+
 
 class TransactionService:
-    def __init__(self, repository: TransactionRepository):
+    def __init__(
+        self, repository: IGenericRepository[Transaction], snapshot: DatasetSnapshot
+    ):
         self.repository = repository
+        self.snapshot = snapshot
+
+    def _date_rows(self, start_date: Optional[date], end_date: Optional[date]) -> slice:
+        """Snapshot rows dated within the range, as a slice of the newest-first columns."""
+        return slice(*self.snapshot.columns.date_bounds(start_date, end_date))
+
+    def _monthly_totals(
+        self, start_date: Optional[date], end_date: Optional[date]
+    ) -> Tuple[int, Dict[str, np.ndarray]]:
+        """Per-month measures (see MonthlyRollup) of the rows in the date range.
+
+        Whole months come from the snapshot's rollup cube; only the rows of a
+        partially covered first or last month are summed from the columns.
+        Returns the first month number and one array per measure.
+        """
+        columns = self.snapshot.columns
+        rows = self._date_rows(start_date, end_date)
+        if rows.start == rows.stop:
+            return 0, {name: np.zeros(0) for name in MEASURES}
+
+        # Without a bound the data itself ends there, so its month counts as whole
+        dates = columns.dates["transaction_date"]
+        first = month_number(dates[rows.stop - 1])
+        last = month_number(dates[rows.start])
+        full_first, full_last = split_months(
+            start_date or month_start(first), end_date or month_end(last)
+        )
+        full_first, full_last = max(full_first, first), min(full_last, last)
+        if full_first > full_last:
+            return first, rows_month_totals(columns, rows, first, last)
+
+        totals = {name: np.zeros(last - first + 1) for name in MEASURES}
+        whole = self.snapshot.rollup.totals_by_month(full_first, full_last)
+        for name in MEASURES:
+            totals[name][full_first - first : full_last - first + 1] += whole[name]
+        for edge in (
+            slice(*columns.date_bounds(start_date, month_start(full_first) - timedelta(days=1))),
+            slice(*columns.date_bounds(month_end(full_last) + timedelta(days=1), end_date)),
+        ):
+            if edge.start < edge.stop:
+                partial = rows_month_totals(columns, edge, first, last)
+                for name in MEASURES:
+                    totals[name] += partial[name]
+        return first, totals
+
+    def _flagged_transactions(
+        self,
+        flag: np.ndarray,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        default_category: str,
+    ) -> List[Transaction]:
+        """Rows with ``flag`` set, shown with their derived balance and category.
+
+        Rows matched only accent-insensitively can still have an empty
+        effective category; they show ``default_category``.
+        """
+        rows = self._date_rows(start_date, end_date)
+        derived = self.snapshot.derived
+        indices = rows.start + np.flatnonzero(flag[rows])
+        transactions = self.snapshot.columns.to_transactions(
+            indices,
+            replace={
+                "balance": derived.net_flow,
+                "category": derived.effective_category,
+            },
+        )
+        for tx in transactions:
+            if not tx.category:
+                tx.category = default_category
+        return transactions
+
+    def _saving_and_investment_balance(self, rows: slice) -> Tuple[float, float]:
+        sums = self.snapshot.prefix_sums
+        return (
+            sums.total("saving", "net_flow", rows),
+            sums.total("investment", "net_flow", rows),
+        )
+
+    def _cached(
+        self,
+        compute: Callable[..., Any],
+        arguments: Tuple[Any, ...],
+        failure: str,
+        default: Any,
+    ) -> Any:
+        """``compute(*arguments)``, cached in the snapshot's response cache.
+
+        ``arguments`` is the key together with the category rule version, so it
+        must hold everything the response depends on. Errors are logged and
+        answered with ``default``, like the uncached service methods.
+        """
+        try:
+            return self.snapshot.responses.get_or_compute(
+                (compute.__name__, self.snapshot.rules_version, *arguments),
+                lambda: compute(*arguments),
+            )
+        except Exception as e:
+            logger.error(f"{failure}: {e}")
+            return default
 
     def _validate_dates(
         self, start_date: Optional[date], end_date: Optional[date]
@@ -47,6 +173,7 @@ class TransactionService:
         start_date: Optional[date],
         end_date: Optional[date],
         clean: bool,
+        accent_insensitive: bool = False,
     ) -> List[Transaction]:
         """Fetches transactions with optional filtering and pagination."""
         try:
@@ -59,6 +186,7 @@ class TransactionService:
                 start_date=start_date,
                 end_date=end_date,
                 clean=clean,
+                accent_insensitive=accent_insensitive,
             )
         except Exception as e:
             logger.error(f"Error fetching transactions: {e}")
@@ -68,24 +196,12 @@ class TransactionService:
         self,
         start_date: Optional[date],
         end_date: Optional[date],
+        accent_insensitive: bool = False,
     ) -> List[Transaction]:
+        derived = self.snapshot.derived
+        flag = derived.is_saving_folded if accent_insensitive else derived.is_saving
         try:
-            transactions = self.repository.get(
-                start_date=start_date, end_date=end_date, limit=-1
-            )
-            clean_transactions = filter_transactions(
-                transactions,
-                description_keywords=[
-                    "TAT TOAN TAI KHOAN TIET KIEM",
-                    "Tiết kiệm Điện tử",
-                    "DONG TIET KIEM TK",
-                    "TAT TOAN SO TIET KIEM",
-                ],
-                category_prefix="saving",
-                default_category="saving",
-            )
-
-            return clean_transactions
+            return self._flagged_transactions(flag, start_date, end_date, "saving")
         except Exception as e:
             logger.error(f"Error fetching transactions: {e}")
             return []
@@ -94,96 +210,152 @@ class TransactionService:
         self,
         start_date: Optional[date],
         end_date: Optional[date],
+        accent_insensitive: bool = False,
     ) -> List[Transaction]:
+        derived = self.snapshot.derived
+        flag = derived.is_investment_folded if accent_insensitive else derived.is_investment
         try:
-            transactions = self.repository.get(
-                start_date=start_date, end_date=end_date, limit=-1
-            )
-
-            clean_transactions = filter_transactions(
-                transactions,
-                description_keywords=["đầu tư"],
-                category_prefix="invest",
-                default_category="invest",
-            )
-
-            return clean_transactions
+            return self._flagged_transactions(flag, start_date, end_date, "invest")
         except Exception as e:
             logger.error(f"Error fetching transactions: {e}")
             return []
 
     def income_expenditure_analysis(
-        self, start_date: Optional[date], end_date: Optional[date]
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
     ) -> List[Dict]:
-        """Analyzes income and expenditure for a given range of years and months."""
+        """Analyzes income and expenditure for a given range of years and months.
+
+        With ``period`` the totals are bucketed by that grain (see domain.utlis.periods).
+        """
         if not self._validate_dates(start_date, end_date):
             return []
 
         try:
-            transactions_filtered = self.repository.get(
-                start_date=start_date, end_date=end_date
-            )
-            summary = defaultdict(lambda: {"income": 0.0, "expenditure": 0.0})
-
-            for tx in transactions_filtered:
-                key = (tx.transaction_date.year, tx.transaction_date.month)
-                summary[key]["income"] += tx.credit
-                summary[key]["expenditure"] += tx.debit
-
+            if period:
+                return self._income_expenditure_by_period(
+                    start_date, end_date, period, anchor_day
+                )
+            first, totals = self._monthly_totals(start_date, end_date)
             return [
-                {"year": year, "month": month, **data}
-                for (year, month), data in sorted(summary.items())
+                {
+                    "year": int((first + offset) // 12 + 1970),
+                    "month": int((first + offset) % 12 + 1),
+                    "income": float(totals["credit"][offset]),
+                    "expenditure": float(totals["debit"][offset]),
+                }
+                for offset in np.flatnonzero(totals["count"])
             ]
         except Exception as e:
             logger.error(f"Error analyzing income and expenditure: {e}")
             return []
 
+    def _income_expenditure_by_period(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        period: str,
+        anchor_day: int,
+    ) -> List[Dict]:
+        if period in _MONTHS_PER_PERIOD:
+            # Calendar grains regroup the monthly cube totals
+            first, totals = self._monthly_totals(start_date, end_date)
+            months = first + np.arange(len(totals["count"]))
+            ids = months // _MONTHS_PER_PERIOD[period]
+            weights = totals
+        else:
+            rows = self._date_rows(start_date, end_date)
+            amounts = self.snapshot.columns.amounts
+            dates = self.snapshot.columns.dates["transaction_date"][rows]
+            ids = period_ids(dates, period, anchor_day)
+            weights = {
+                "credit": amounts["credit"][rows],
+                "debit": amounts["debit"][rows],
+                "count": np.ones(len(ids)),
+            }
+        buckets, inverse = np.unique(ids, return_inverse=True)
+        sums = {
+            name: np.bincount(inverse.reshape(-1), weights=weights[name], minlength=len(buckets))
+            for name in ("credit", "debit", "count")
+        }
+        return [
+            {
+                **period_info(int(bucket), period, anchor_day, start_date, end_date),
+                "income": float(sums["credit"][i]),
+                "expenditure": float(sums["debit"][i]),
+            }
+            for i, bucket in enumerate(buckets)
+            if sums["count"][i]
+        ]
+
+    def _overview(self, rows: slice) -> Dict[str, float]:
+        sums = self.snapshot.prefix_sums
+        saving_balance, investment_balance = self._saving_and_investment_balance(rows)
+
+        total_income = (
+            sums.total("clean", "credit", rows) + saving_balance + investment_balance
+        )
+        total_expense = sums.total("clean", "debit", rows)
+        total_saving = saving_balance + investment_balance
+
+        return {
+            "income": total_income,
+            "expense": total_expense,
+            "saving": total_saving,
+        }
+
     def generate_overview_section(
-        self, start_date: Optional[date], end_date: Optional[date]
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
     ) -> Dict[str, Any]:
-        """Generates an overview of income, expense, and savings."""
-        try:
-            transactions = self.repository.get(start_date=start_date, end_date=end_date)
-            saving_transactions = filter_transactions(
-                transactions,
-                description_keywords=[
-                    "TAT TOAN TAI KHOAN TIET KIEM",
-                    "Tiết kiệm Điện tử",
-                    "DONG TIET KIEM TK",
-                    "TAT TOAN SO TIET KIEM",
-                ],
-                category_prefix="saving",
-                default_category="saving",
-            )
+        """Generates an overview of income, expense, and savings.
 
-            investment_transactions = filter_transactions(
-                transactions,
-                description_keywords=["đầu tư"],
-                category_prefix="invest",
-                default_category="invest",
-            )
-            saving_balance = sum(tx.balance for tx in saving_transactions)
-            investment_balance = sum(tx.balance for tx in investment_transactions)
-
-            clean_transactions = clean_data(transactions)
-            total_income = (
-                sum(tx.credit for tx in clean_transactions)
-                + saving_balance
-                + investment_balance
-            )
-            total_expense = sum(tx.debit for tx in clean_transactions)
-            total_saving = saving_balance + investment_balance
-
-            return {
-                "income": total_income,
-                "expense": total_expense,
-                "saving": total_saving,
-            }
+        With ``period`` the overview of every period is added under "periods".
+        """
+        try:
+            rows = self._date_rows(start_date, end_date)
+            overview = self._overview(rows)
+            if period:
+                overview["periods"] = self._overview_by_period(
+                    rows, start_date, end_date, period, anchor_day
+                )
+            return overview
 
         except Exception as e:
             logger.error(f"Error generating overview section: {e}")
             return []
 
+    def _overview_by_period(
+        self,
+        rows: slice,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        period: str,
+        anchor_day: int,
+    ) -> List[Dict[str, Any]]:
+        """Overview per period; each period is one row slice answered by prefix sums."""
+        if rows.start == rows.stop:
+            return []
+        columns = self.snapshot.columns
+        dates = columns.dates["transaction_date"]
+        periods = []
+        # Rows are newest first: the last row of the range is the oldest
+        for period_id in range(
+            period_ids(dates[rows.stop - 1], period, anchor_day),
+            period_ids(dates[rows.start], period, anchor_day) + 1,
+        ):
+            info = period_info(period_id, period, anchor_day, start_date, end_date)
+            lo, hi = columns.date_bounds(info["start_date"], info["end_date"])
+            if lo < hi:
+                periods.append({**info, **self._overview(slice(lo, hi))})
+        return periods
+
     def generate_summary(
         self,
         start_date: Optional[date],
@@ -191,34 +363,19 @@ class TransactionService:
     ) -> Dict[str, Any]:
         """Generates a financial summary including total assets and transaction count."""
         try:
-            transactions = self.repository.get(start_date=start_date, end_date=end_date)
-            saving_transactions = filter_transactions(
-                transactions,
-                description_keywords=[
-                    "TAT TOAN TAI KHOAN TIET KIEM",
-                    "Tiết kiệm Điện tử",
-                    "DONG TIET KIEM TK",
-                    "TAT TOAN SO TIET KIEM",
-                ],
-                category_prefix="saving",
-                default_category="saving",
-            )
+            rows = self._date_rows(start_date, end_date)
+            sums = self.snapshot.prefix_sums
+            saving_balance, investment_balance = self._saving_and_investment_balance(rows)
 
-            investment_transactions = filter_transactions(
-                transactions,
-                description_keywords=["đầu tư"],
-                category_prefix="invest",
-                default_category="invest",
+            # Rows are newest first, so the first clean row holds the current balance
+            newest = sums.first_clean_row(rows)
+            balance = (
+                float(self.snapshot.columns.amounts["balance"][newest])
+                if newest is not None
+                else 0
             )
-            saving_balance = sum(tx.balance for tx in saving_transactions)
-            investment_balance = sum(tx.balance for tx in investment_transactions)
-
-            clean_transactions = clean_data(transactions)
-            saving_balance = sum(tx.balance for tx in saving_transactions)
-            investment_balance = sum(tx.balance for tx in investment_transactions)
-            balance = clean_transactions[0].balance if clean_transactions else 0
             total_asset = balance + saving_balance + investment_balance
-            transaction_count = len(clean_transactions)
+            transaction_count = int(sums.total("clean", "count", rows))
 
             return {
                 "total": total_asset,
@@ -237,70 +394,660 @@ class TransactionService:
         start_date: Optional[date],
         end_date: Optional[date],
         limit: int = -1,
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+        max_points: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Computes balance trends over time."""
-        try:
-            filtered_transactions = self.repository.get(
-                start_date=start_date, end_date=end_date, limit=limit, offset=offset
-            )
-            filtered_transactions = filtered_transactions[offset : offset + limit]
-            daily_balances = defaultdict(float)
-
-            for tx in sorted(filtered_transactions, key=lambda t: t.transaction_date):
-                day_key = tx.transaction_date.strftime("%Y-%m-%d")
-                daily_balances[day_key] = tx.balance
+        """Computes balance trends over time.
 
+        Daily by default; with ``period`` the closing balance of every period.
+        ``max_points`` downsamples longer series with LTTB (see domain.utlis.downsampling).
+        """
+        try:
+            rows = self._date_rows(start_date, end_date)
+            # Page the range's rows (newest first) like repository.get; -1 keeps them all
+            first = min(rows.start + offset, rows.stop)
+            page = slice(first, rows.stop if limit < 0 else min(first + limit, rows.stop))
+            points = self._last_of_day(page)
+            if period:
+                points, period_numbers = self._closing_rows(points, period, anchor_day)
+            if max_points and len(points) > max_points:
+                kept = self._downsampled(points, max_points)
+                points = points[kept]
+                if period:
+                    period_numbers = period_numbers[kept]
+            if not period:
+                return self._balance_points(points)
             return [
-                {"date": day, "balance": balance}
-                for day, balance in daily_balances.items()
+                {
+                    **period_info(period_id, period, anchor_day, start_date, end_date),
+                    "balance": balance,
+                }
+                for period_id, balance in zip(
+                    period_numbers.tolist(),
+                    self.snapshot.columns.amounts["balance"][points].tolist(),
+                )
             ]
         except Exception as e:
             logger.error(f"Error computing balance trends: {e}")
             return []
 
+    def _downsampled(self, points: np.ndarray, max_points: int) -> np.ndarray:
+        """Positions of the ``max_points`` balance rows that keep the series' visual shape."""
+        columns = self.snapshot.columns
+        days = columns.dates["transaction_date"][points].astype(np.int64)
+        return lttb_indices(days, columns.amounts["balance"][points], max_points)
+
+    def _closing_rows(
+        self, points: np.ndarray, period: str, anchor_day: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """The last of the daily ``points`` in each period, with its period number."""
+        ids = period_ids(self.snapshot.columns.dates["transaction_date"][points], period, anchor_day)
+        last = np.append(ids[1:] != ids[:-1], True)
+        return points[last], ids[last]
+
     def expense_tree(
         self,
         offset: int,
         start_date: Optional[date],
         end_date: Optional[date],
         limit: int = -1,
+        period: Optional[str] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
     ) -> List[Dict[str, Any]]:
-        try:
-            # Fetch transactions from repository
-            filtered_transactions = self.repository.get(
-                start_date=start_date, end_date=end_date, limit=limit, offset=offset
+        """Debit totals per expense category; with ``period`` one tree per period."""
+        return self._cached(
+            self._expense_tree,
+            # anchor_day only matters for cycles; other grains share one entry
+            (
+                offset,
+                start_date,
+                end_date,
+                limit,
+                period,
+                anchor_day if period == "cycle" else DEFAULT_ANCHOR_DAY,
+            ),
+            "Error computing expense tree",
+            [],
+        )
+
+    def _expense_tree(
+        self,
+        offset: int,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        limit: int,
+        period: Optional[str],
+        anchor_day: int,
+    ) -> List[Dict[str, Any]]:
+        rows = self._date_rows(start_date, end_date)
+        indices = np.arange(rows.start, rows.stop)
+
+        columns = self.snapshot.columns
+        indices = indices[
+            columns.strings["counter_account"].mask_where(lambda value: value != "", indices)
+        ]
+
+        # Every row of the range is aggregated; limit/offset page the category entries
+        def page(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return entries[offset:] if limit == -1 else entries[offset : offset + limit]
+
+        if not period:
+            return page(self._category_sizes(indices))
+
+        # Group rows by period (oldest first); the stable sort keeps the row order
+        ids = period_ids(columns.dates["transaction_date"][indices], period, anchor_day)
+        order = np.argsort(ids, kind="stable")
+        ids, indices = ids[order], indices[order]
+        starts = np.flatnonzero(np.append(True, ids[1:] != ids[:-1]))
+        return [
+            {
+                **period_info(int(ids[start]), period, anchor_day, start_date, end_date),
+                "children": page(self._category_sizes(indices[start:stop])),
+            }
+            for start, stop in zip(starts, np.append(starts[1:], len(ids)))
+        ]
+
+    def _category_sizes(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Treemap entries: debits summed per precomputed expense category code."""
+        columns, derived = self.snapshot.columns, self.snapshot.derived
+        codes = derived.expense_category.codes[indices]
+        totals = np.bincount(
+            codes,
+            weights=columns.amounts["debit"][indices],
+            minlength=len(derived.expense_category.values),
+        )
+
+        # Categories in order of first appearance, like the old per-row loop
+        _, first_seen = np.unique(codes, return_index=True)
+        category_totals = {
+            derived.expense_category.values[code]: float(totals[code])
+            for code in codes[np.sort(first_seen)]
+        }
+
+        # Format for frontend Treemap
+        return [
+            {"name": name, "size": amount}
+            for name, amount in category_totals.items()
+            if amount > 0
+        ]
+
+    def expense_treemap(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        by_month: bool = False,
+        top_n: int = 10,
+        clean: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Debits as a tree: expense category, then counter account, then (optionally) month.
+
+        Each level keeps its ``top_n`` largest children (-1 keeps all) and merges
+        the rest into an "Others" child. Nodes are ``{name, size, children}``.
+        """
+        return self._cached(
+            self._expense_treemap,
+            (start_date, end_date, by_month, top_n, clean),
+            "Error computing expense treemap",
+            [],
+        )
+
+    def _expense_treemap(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        by_month: bool,
+        top_n: int,
+        clean: bool,
+    ) -> List[Dict[str, Any]]:
+        columns, derived = self.snapshot.columns, self.snapshot.derived
+        rows = self._date_rows(start_date, end_date)
+        indices = np.arange(rows.start, rows.stop)
+        if clean:
+            indices = indices[~derived.excluded[indices]]
+        debit = columns.amounts["debit"]
+        indices = indices[debit[indices] > 0]
+        # Rows without a counter account are left out, as in expense_tree
+        indices = indices[
+            columns.strings["counter_account"].mask_where(lambda value: value != "", indices)
+        ]
+
+        # One group-by over the rows; the tree is then built from these cells only
+        keys = [
+            derived.expense_category.codes[indices],
+            columns.strings["counter_account"].codes[indices],
+        ]
+        names = [derived.expense_category.values, columns.strings["counter_account"].values]
+        if by_month:
+            months = month_number(columns.dates["transaction_date"][indices])
+            keys.append(months)
+            names.append(None)
+        cells, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+        sizes = np.bincount(inverse.reshape(-1), weights=debit[indices], minlength=len(cells))
+
+        def label(level: int, key: int) -> str:
+            if names[level] is None:
+                return period_label(key, "month")
+            return names[level][key]
+
+        def children(cell_ids: np.ndarray, level: int) -> List[Dict[str, Any]]:
+            level_keys, group = np.unique(cells[cell_ids, level], return_inverse=True)
+            group = group.reshape(-1)
+            totals = np.bincount(group, weights=sizes[cell_ids], minlength=len(level_keys))
+            order = np.argsort(-totals, kind="stable")
+            kept = order if top_n == -1 else order[:top_n]
+            nodes = {label(level, int(level_keys[i])): group == i for i in kept}
+            rest = np.isin(group, order[len(kept) :])
+            if rest.any():
+                # Merged into a kept "Others" (the default category) if there is one
+                nodes["Others"] = nodes.get("Others", np.zeros_like(rest)) | rest
+
+            tree = []
+            for name, members in nodes.items():
+                node = {"name": name, "size": float(sizes[cell_ids[members]].sum())}
+                if level + 1 < cells.shape[1]:
+                    node["children"] = children(cell_ids[members], level + 1)
+                tree.append(node)
+            return sorted(tree, key=lambda node: -node["size"])
+
+        return children(np.arange(len(cells)), 0) if len(cells) else []
+
+    def dashboard(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        sections: Optional[List[str]] = None,
+        top_n: int = 4,
+        categories: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Every section of the monthly dashboard for one date range.
+
+        ``sections`` picks a subset of DASHBOARD_SECTIONS (all by default).
+        ``categories`` are search terms; "category_top" holds the top ``top_n``
+        debits matching each of them.
+        """
+        sections = tuple(sections or DASHBOARD_SECTIONS)
+        categories = tuple(categories or ())
+        return self._cached(
+            self._dashboard,
+            (start_date, end_date, sections, top_n, categories),
+            "Error building dashboard",
+            {},
+        )
+
+    def _dashboard(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        sections: Tuple[str, ...],
+        top_n: int,
+        categories: Tuple[str, ...],
+    ) -> Dict[str, Any]:
+        # The range and its clean rows are resolved once and shared by every section
+        columns = self.snapshot.columns
+        rows = self._date_rows(start_date, end_date)
+        indices = np.arange(rows.start, rows.stop)
+        clean = indices[~self.snapshot.derived.excluded[indices]]
+
+        builders = {
+            "overview": lambda: self._overview(rows),
+            "summary": lambda: self.generate_summary(start_date, end_date),
+            "income_expenditure": lambda: self.income_expenditure_analysis(
+                start_date, end_date
+            ),
+            "balance_trends": lambda: self._daily_balances(rows),
+            "top_debits": lambda: self._top_debits(clean, top_n),
+            # Newest first already, as sorting by transaction_date would return them
+            "latest": lambda: columns.to_transactions(clean[:top_n]),
+            "category_top": lambda: {
+                category: self._top_debits(
+                    clean[self.snapshot.search_index.search(category, clean)], top_n
+                )
+                for category in categories
+            },
+            "expense_tree": lambda: self._category_sizes(
+                indices[
+                    columns.strings["counter_account"].mask_where(
+                        lambda value: value != "", indices
+                    )
+                ]
+            ),
+        }
+        return {section: builders[section]() for section in sections}
+
+    def _top_debits(self, indices: np.ndarray, top_n: int) -> List[Transaction]:
+        """Largest debits first; ties keep the newest-first order."""
+        columns = self.snapshot.columns
+        return columns.to_transactions(
+            columns.sorted_rows(indices, "debit", descending=True, limit=top_n)
+        )
+
+    def _last_of_day(self, rows: slice) -> np.ndarray:
+        """Snapshot row of each day in ``rows`` (oldest day first): its last row in row order."""
+        dates = self.snapshot.columns.dates["transaction_date"][rows]
+        if not len(dates):
+            return np.zeros(0, dtype=np.int64)
+        return rows.start + np.flatnonzero(np.append(dates[:-1] != dates[1:], True))[::-1]
+
+    def _balance_points(self, points: np.ndarray) -> List[Dict[str, Any]]:
+        columns = self.snapshot.columns
+        return [
+            {"date": str(day), "balance": balance}
+            for day, balance in zip(
+                columns.dates["transaction_date"][points].tolist(),
+                columns.amounts["balance"][points].tolist(),
             )
+        ]
+
+    def _daily_balances(self, rows: slice) -> List[Dict[str, Any]]:
+        """Balance trend by day (oldest first): the last row of each day in row order."""
+        return self._balance_points(self._last_of_day(rows))
 
-            # Slice the list if needed
-            filtered_transactions = (
-                filtered_transactions[offset : offset + limit]
-                if limit != -1
-                else filtered_transactions
+    def rolling(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        windows: Sequence[int] = (7, 30, 90),
+        measure: str = "debit",
+        by_category: bool = False,
+    ) -> Dict[str, Any]:
+        """Moving sums, means and standard deviations of a daily measure.
+
+        Each day of the range gets the statistics of the ``window`` days ending
+        on it, for every window; clean rows only, with the exclusion rules
+        applied to the stored category like expense-tree and aggregate.
+        ``by_category`` gives one series per expense category with rows in
+        the range instead of a single total. Ranges are limited to
+        ROLLING_MAX_DAYS days; an open bound keeps the newest ones.
+        """
+        if not self._validate_dates(start_date, end_date):
+            return {}
+        if start_date and end_date and (end_date - start_date).days >= ROLLING_MAX_DAYS:
+            logger.warning(
+                f"Rolling range longer than {ROLLING_MAX_DAYS} days: {start_date}..{end_date}"
             )
+            return {}
+
+        windows = tuple(sorted(set(windows)))
+        return self._cached(
+            self._rolling,
+            (start_date, end_date, windows, measure, by_category),
+            "Error computing rolling windows",
+            {},
+        )
+
+    def _rolling(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        windows: Tuple[int, ...],
+        measure: str,
+        by_category: bool,
+    ) -> Dict[str, Any]:
+        columns, derived = self.snapshot.columns, self.snapshot.derived
+        result = {"measure": measure, "windows": list(windows), "dates": [], "series": []}
+        dates = columns.dates["transaction_date"]
+        rows = self._date_rows(start_date, end_date)
+        if rows.start == rows.stop and (start_date is None or end_date is None):
+            return result
 
-            # Prepare a category sum map
-            category_totals = defaultdict(float)
+        # Open bounds end at the data; the first day also needs the longest window's history
+        first = np.datetime64(start_date, "D") if start_date else dates[rows.stop - 1]
+        last = np.datetime64(end_date, "D") if end_date else dates[rows.start]
+        first = max(first, last - (ROLLING_MAX_DAYS - 1))
+        lookback = windows[-1] - 1
+        origin = first - lookback
+        n_days = int((last - origin).astype(np.int64)) + 1
 
-            for tx in filtered_transactions:
-                debit = tx.debit
-                description = tx.counter_account
-                category = tx.category
+        span = slice(*columns.date_bounds(origin.astype(date), last.astype(date)))
+        clean = span.start + np.flatnonzero(~derived.excluded[span])
+        day = (dates[clean] - origin).astype(np.int64)
+        values = derived.net_flow if measure == "net_flow" else columns.amounts[measure]
+        if by_category:
+            # Categories seen only in the lookback history get no series
+            codes = derived.expense_category.codes[clean]
+            present = np.unique(codes[day >= lookback])
+            kept = np.isin(codes, present)
+            clean, day = clean[kept], day[kept]
+            series = np.searchsorted(present, codes[kept])
+            names = derived.expense_category.values[present].tolist()
+        else:
+            series, names = np.zeros(len(clean), dtype=np.int64), [None]
 
-                if debit is None or not description:
-                    continue
+        # Dense (series x day) array in one bincount
+        daily = np.bincount(
+            series.reshape(-1) * n_days + day,
+            weights=values[clean],
+            minlength=len(names) * n_days,
+        ).reshape(len(names), n_days).astype(np.float64)
 
-                expense_category = categorize_expense(description, category)
-                category_totals[expense_category] += debit
+        stats = {window: rolling_stats(daily, window) for window in windows}
+        n_out = n_days - lookback
+        result["dates"] = np.arange(first, last + 1).astype(str).tolist()
+        result["series"] = [
+            {
+                "category": name,
+                "daily": daily[i, lookback:].tolist(),
+                "windows": {
+                    str(window): {
+                        stat: array[i, -n_out:].tolist()
+                        for stat, array in stats[window].items()
+                    }
+                    for window in windows
+                },
+            }
+            for i, name in enumerate(names)
+        ]
+        return result
+
+    def aggregate(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        group_by: Sequence[str] = (),
+        measures: Sequence[Tuple[str, Optional[str]]] = (("count", None),),
+        query: Optional[str] = None,
+        clean: bool = False,
+        accent_insensitive: bool = False,
+        expense_categories: Sequence[str] = (),
+        counter_accounts: Sequence[str] = (),
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+        sort_by: Optional[str] = None,
+        limit: int = -1,
+    ) -> Dict[str, Any]:
+        """Generic group-by over the snapshot columns (see domain.utlis.aggregation).
 
-            # Format for frontend Treemap
-            result = [
-                {"name": name, "size": amount}
-                for name, amount in category_totals.items()
-                if amount > 0
+        Rows in the date range are filtered like the transaction list (search,
+        clean) and by expense category / counter account, grouped by the
+        ``group_by`` fields (a period grain and/or text fields) and reduced with
+        each measure. Groups are ordered by their keys, by the ``sort_by``
+        measure (largest first) or by the ``sort_by`` group field alone;
+        ``limit`` keeps the first groups.
+        """
+        if not self._validate_dates(start_date, end_date):
+            return {}
+
+        arguments = (
+            start_date,
+            end_date,
+            tuple(group_by),
+            tuple(measures),
+            query,
+            clean,
+            accent_insensitive,
+            tuple(expense_categories),
+            tuple(counter_accounts),
+            anchor_day,
+            sort_by,
+            limit,
+        )
+        return self._cached(
+            self._aggregate, arguments, "Error aggregating transactions", {}
+        )
+
+    def _aggregate(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date],
+        group_by: Tuple[str, ...],
+        measures: Tuple[Tuple[str, Optional[str]], ...],
+        query: Optional[str],
+        clean: bool,
+        accent_insensitive: bool,
+        expense_categories: Tuple[str, ...],
+        counter_accounts: Tuple[str, ...],
+        anchor_day: int,
+        sort_by: Optional[str],
+        limit: int,
+    ) -> Dict[str, Any]:
+        columns, derived = self.snapshot.columns, self.snapshot.derived
+        text_columns = {**columns.strings, "expense_category": derived.expense_category}
+
+        # Filters, in the order of the columnar repository
+        rows = self._date_rows(start_date, end_date)
+        indices = np.arange(rows.start, rows.stop)
+        if clean:
+            excluded = derived.excluded_folded if accent_insensitive else derived.excluded
+            indices = indices[~excluded[indices]]
+        if query:
+            indices = indices[
+                self.snapshot.search_index.search(query, indices, accent_insensitive)
             ]
+        for field, wanted in (
+            ("expense_category", expense_categories),
+            ("counter_account", counter_accounts),
+        ):
+            if wanted:
+                column = text_columns[field]
+                indices = indices[np.isin(column.values, wanted)[column.codes[indices]]]
 
+        names = measure_names(measures)
+        result = {"group_by": list(group_by), "measures": names, "columns": {}}
+        if not len(indices):
+            result["columns"] = {name: [] for name in (*group_by, *names)}
             return result
 
-        except Exception as e:
-            logger.error(f"Error computing expense tree: {e}")
-            return []
+        keys = [
+            period_ids(columns.dates["transaction_date"][indices], field, anchor_day)
+            if field in PERIODS
+            else text_columns[field].codes[indices]
+            for field in group_by
+        ]
+        groups, inverse = group_ids(keys, len(indices))
+        values = {
+            "debit": columns.amounts["debit"][indices],
+            "credit": columns.amounts["credit"][indices],
+            "net_flow": derived.net_flow[indices],
+        }
+        reduced = {
+            name: aggregate(measure, values.get(field), inverse, len(groups))
+            for name, (measure, field) in zip(names, measures)
+        }
+
+        # Group keys sort ascending (chronological, alphabetical), measures largest first
+        order = np.arange(len(groups))
+        if sort_by in reduced:
+            order = np.argsort(-reduced[sort_by], kind="stable")
+        elif sort_by in group_by:
+            order = np.argsort(groups[:, list(group_by).index(sort_by)], kind="stable")
+        if limit != -1:
+            order = order[:limit]
+
+        for position, field in enumerate(group_by):
+            group_keys = groups[order, position]
+            if field in PERIODS:
+                distinct, inverse_keys = np.unique(group_keys, return_inverse=True)
+                labels = np.array(
+                    [period_label(int(key), field, anchor_day) for key in distinct], dtype=object
+                )
+                result["columns"][field] = labels[inverse_keys.reshape(-1)].tolist()
+            else:
+                result["columns"][field] = text_columns[field].values[group_keys].tolist()
+        for name in names:
+            result["columns"][name] = reduced[name][order].tolist()
+        return result
+
+    def compare(
+        self,
+        group_by: Sequence[str] = ("expense_category",),
+        measures: Sequence[Tuple[str, Optional[str]]] = (("sum", "debit"),),
+        base: Optional[Tuple[date, date]] = None,
+        target: Optional[Tuple[date, date]] = None,
+        period: Optional[str] = None,
+        periods: int = 1,
+        end_date: Optional[date] = None,
+        anchor_day: int = DEFAULT_ANCHOR_DAY,
+        clean: bool = True,
+    ) -> Dict[str, Any]:
+        """Measures per group for several periods, with the change between consecutive periods.
+
+        Either ``base`` and ``target`` date ranges, or the last ``periods``
+        periods of a grain (the one holding ``end_date``, by default the newest
+        transaction, and those before it) each preceded by its predecessor.
+        Measures are count, sum or mean (see domain.utlis.aggregation).
+        """
+        arguments = (
+            tuple(group_by),
+            tuple(measures),
+            base,
+            target,
+            period,
+            periods,
+            end_date,
+            anchor_day,
+            clean,
+        )
+        return self._cached(self._compare, arguments, "Error comparing periods", {})
+
+    def _compared_periods(
+        self,
+        base: Optional[Tuple[date, date]],
+        target: Optional[Tuple[date, date]],
+        period: Optional[str],
+        periods: int,
+        end_date: Optional[date],
+        anchor_day: int,
+    ) -> List[Dict[str, Any]]:
+        if period is None:
+            return [
+                {"period": name, "start_date": start, "end_date": end}
+                for name, (start, end) in (("base", base), ("target", target))
+            ]
+        dates = self.snapshot.columns.dates["transaction_date"]
+        if end_date is None:
+            if not len(dates):
+                return []
+            end_date = dates[0].astype(date)
+        last = period_ids(end_date, period, anchor_day)
+        return [
+            period_info(period_id, period, anchor_day)
+            for period_id in range(last - periods, last + 1)
+        ]
+
+    def _compare(
+        self,
+        group_by: Tuple[str, ...],
+        measures: Tuple[Tuple[str, Optional[str]], ...],
+        base: Optional[Tuple[date, date]],
+        target: Optional[Tuple[date, date]],
+        period: Optional[str],
+        periods: int,
+        end_date: Optional[date],
+        anchor_day: int,
+        clean: bool,
+    ) -> Dict[str, Any]:
+        columns, derived = self.snapshot.columns, self.snapshot.derived
+        text_columns = {**columns.strings, "expense_category": derived.expense_category}
+        compared = self._compared_periods(base, target, period, periods, end_date, anchor_day)
+
+        # Each period is a row slice; the rows of all periods are reduced together,
+        # keyed by (group, period slot)
+        slices = [columns.date_bounds(item["start_date"], item["end_date"]) for item in compared]
+        indices = np.concatenate(
+            [np.arange(lo, hi) for lo, hi in slices] or [np.zeros(0, dtype=np.int64)]
+        )
+        slots = np.repeat(np.arange(len(slices)), [hi - lo for lo, hi in slices])
+        if clean:
+            kept = ~derived.excluded[indices]
+            indices, slots = indices[kept], slots[kept]
+
+        groups, inverse = group_ids(
+            [text_columns[field].codes[indices] for field in group_by], len(indices)
+        )
+        if not len(indices):
+            groups = groups[:0]
+        values = {
+            "debit": columns.amounts["debit"][indices],
+            "credit": columns.amounts["credit"][indices],
+            "net_flow": derived.net_flow[indices],
+        }
+        cells = inverse * len(compared) + slots
+        n_cells = len(groups) * len(compared)
+
+        result = {
+            "group_by": list(group_by),
+            "periods": compared,
+            "groups": {
+                field: text_columns[field].values[groups[:, position]].tolist()
+                for position, field in enumerate(group_by)
+            },
+            "measures": {},
+        }
+        for function, field in measures:
+            name = function if field is None else f"{function}:{field}"
+            # (period, group) table of the measure
+            table = aggregate(function, values.get(field), cells, n_cells)
+            table = table.reshape(len(groups), len(compared)).T
+            previous, current = table[:-1], table[1:]
+            delta = current - previous
+            with np.errstate(divide="ignore", invalid="ignore"):
+                change = np.where(previous != 0, delta / np.abs(previous) * 100, np.nan)
+            result["measures"][name] = {
+                "values": table.tolist(),
+                "delta": delta.tolist(),
+                "pct_change": [
+                    [None if np.isnan(value) else value for value in row]
+                    for row in change.tolist()
+                ],
+            }
+        return result
@@ -0,0 +1,96 @@
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.utlis.periods import PERIODS
+
+# Text dimensions accepted by group_by, besides the period grains
+GROUP_FIELDS = ("category", "expense_category", "counter_account", "transaction_code")
+MEASURE_FIELDS = ("debit", "credit", "net_flow")
+_FUNCTIONS = ("sum", "mean", "min", "max")
+_QUANTILE = re.compile(r"^p(\d{1,2}|100)$")
+
+
+def parse_group_by(text: str) -> List[str]:
+    """Comma-separated group_by fields; at most one of them may be a period grain."""
+    fields = [field.strip() for field in text.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in GROUP_FIELDS + PERIODS]
+    if unknown:
+        raise ValueError(f"Unknown group_by fields: {', '.join(unknown)}")
+    if sum(field in PERIODS for field in fields) > 1:
+        raise ValueError("group_by accepts at most one period grain")
+    if len(set(fields)) != len(fields):
+        raise ValueError("group_by fields must not repeat")
+    return fields
+
+
+def parse_measures(text: str) -> List[Tuple[str, Optional[str]]]:
+    """Comma-separated measures: ``count`` or ``<function>:<field>``.
+
+    Functions are sum, mean, min, max and quantiles p0 .. p100 (p50 is the
+    median); fields are debit, credit and net_flow.
+    """
+    measures = []
+    for measure in (part.strip() for part in text.split(",")):
+        if not measure:
+            continue
+        if measure == "count":
+            measures.append(("count", None))
+            continue
+        function, _, field = measure.partition(":")
+        if function not in _FUNCTIONS and not _QUANTILE.match(function):
+            raise ValueError(f"Unknown measure function: {function}")
+        if field not in MEASURE_FIELDS:
+            raise ValueError(f"Unknown measure field in {measure}")
+        measures.append((function, field))
+    if not measures:
+        raise ValueError("At least one measure is required")
+    return measures
+
+
+def measure_names(measures: Sequence[Tuple[str, Optional[str]]]) -> List[str]:
+    """Result column names of parsed measures: ``count`` or ``<function>:<field>``."""
+    return [function if field is None else f"{function}:{field}" for function, field in measures]
+
+
+def group_ids(keys: Sequence[np.ndarray], n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct key tuples (sorted) and the group number of each of the ``n_rows`` rows.
+
+    Without keys every row falls in one group.
+    """
+    if not keys:
+        return np.zeros((1, 0), dtype=np.int64), np.zeros(n_rows, dtype=np.int64)
+    groups, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+    return groups, inverse.reshape(-1)
+
+
+def aggregate(
+    function: str, values: np.ndarray, groups: np.ndarray, n_groups: int
+) -> np.ndarray:
+    """One vectorized reduction of ``values`` per group number (0 .. n_groups - 1).
+
+    Counts are integers; every other function returns floats.
+    """
+    counts = np.bincount(groups, minlength=n_groups)
+    if function == "count":
+        return counts.astype(np.int64)
+    if function in ("sum", "mean"):
+        sums = np.bincount(groups, weights=values, minlength=n_groups)
+        return sums if function == "sum" else sums / np.maximum(counts, 1)
+
+    # Order statistics: sort by (group, value), groups become contiguous runs
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    if function == "min":
+        return ordered[starts]
+    if function == "max":
+        return ordered[starts + counts - 1]
+
+    # Quantile with linear interpolation, like numpy.quantile
+    position = int(function[1:]) / 100 * (counts - 1)
+    below = np.floor(position).astype(np.int64)
+    above = np.ceil(position).astype(np.int64)
+    low, high = ordered[starts + below], ordered[starts + above]
+    return low + (high - low) * (position - below)
@@ -1,12 +1,25 @@
+import hashlib
+import json
+import os
 import pandas as pd
 import logging
-from typing import List
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
 
 from domain.models.transaction import Transaction
+from domain.utlis.clean_data import sort_newest_first
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # the parquet snapshot cache is optional
+    pa = pq = None
 
 logger = logging.getLogger("uvicorn")
 
-_CACHED_TRANSACTIONS: List[Transaction] = []
+_TRANSACTION_LIST_ADAPTER = TypeAdapter(List[Transaction])
 _FILE_PATH = "D://1.Project//1.project//tool//tool-finance-analysis-py//finance-analysis-for-research//finance-dashboard//src//shared//db//data.xlsx"
 
 
@@ -33,32 +46,144 @@ def read_data_excel(path: str):
     return df
 
 
-def read_transactions_from_csv(
-    file_path: str = _FILE_PATH, reload: bool = False
-) -> List[Transaction]:
-    """Reads transactions from CSV and caches them. If reload=True, refresh the cache."""
-    global _CACHED_TRANSACTIONS
+# Bump when read_data_excel changes the shape of the frame it returns
+_SNAPSHOT_FORMAT = 1
+_SNAPSHOT_METADATA_KEY = b"finance_source"
 
-    if reload:
-        logger.info("🔄 Reloading transactions from CSV: %s", file_path)
-        _CACHED_TRANSACTIONS.clear()
 
-    if not _CACHED_TRANSACTIONS:
-        logger.info(
-            "📂 Loading transactions from CSV for the first time: %s", file_path
-        )
-        df = read_data_excel(file_path)
-        # _CACHED_TRANSACTIONS = [Transaction(**row) for _, row in df.iterrows()]
-        for _, row in df.iterrows():
-            try:
-                transaction = Transaction(**row.to_dict())
-                _CACHED_TRANSACTIONS.append(transaction)
-            except Exception as e:
-                logger.error(f"🚨 Error processing row: {row.to_dict()}")
-                logger.error(f"❌ Validation Error: {e}")
-    else:
-        logger.info(
-            "⚡ Using cached transactions (%d items)", len(_CACHED_TRANSACTIONS)
+def snapshot_path(path: str) -> str:
+    """Location of the derived parquet snapshot written next to the source file."""
+    return f"{path}.snapshot.parquet"
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stat(path: str) -> dict:
+    stat = os.stat(path)
+    return {
+        "format": _SNAPSHOT_FORMAT,
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _read_snapshot_fingerprint(path: str) -> Optional[dict]:
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata[_SNAPSHOT_METADATA_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
+
+
+def source_fingerprint(path: str) -> dict:
+    """Size, mtime and sha256 of a source file, stored with data derived from it."""
+    return {**_source_stat(path), "sha256": _file_digest(path)}
+
+
+def fingerprint_matches(fingerprint: Optional[dict], path: str) -> bool:
+    """True when ``fingerprint`` (see source_fingerprint) still describes ``path``."""
+    # Cheap stat fields are compared first so stale data never pays for hashing
+    if fingerprint is None:
+        return False
+    if any(fingerprint.get(key) != value for key, value in _source_stat(path).items()):
+        return False
+    return fingerprint.get("sha256") == _file_digest(path)
+
+
+def _write_snapshot(df: pd.DataFrame, path: str, fingerprint: dict) -> None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            _SNAPSHOT_METADATA_KEY: json.dumps(fingerprint).encode("utf-8"),
+        }
+    )
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        pq.write_table(table, temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_data_cached(path: str) -> pd.DataFrame:
+    """Same frame as read_data_excel, served from a parquet snapshot while the source is unchanged."""
+    if pq is None:
+        return read_data_excel(path)
+
+    cache_path = snapshot_path(path)
+    if fingerprint_matches(_read_snapshot_fingerprint(cache_path), path):
+        logger.info("⚡ Loading transactions snapshot: %s", cache_path)
+        return pq.read_table(cache_path).to_pandas()
+
+    # Fingerprint before parsing so an edit made meanwhile invalidates the snapshot
+    fingerprint = source_fingerprint(path)
+    df = read_data_excel(path)
+    try:
+        _write_snapshot(df, cache_path, fingerprint)
+        logger.info("💾 Wrote transactions snapshot: %s", cache_path)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"⚠️ Could not write transactions snapshot {cache_path}: {e}")
+    return df
+
+
+def _frame_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Row dicts built from whole-column lists, with dates already as datetime.date."""
+    columns = {
+        name: (
+            df[name].dt.date.tolist()
+            if pd.api.types.is_datetime64_any_dtype(df[name])
+            else df[name].tolist()
         )
+        for name in df.columns
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def build_transactions(
+    df: pd.DataFrame,
+) -> Tuple[List[Transaction], List[Dict[str, Any]]]:
+    """Validates every row of the frame in one batch.
+
+    Returns the valid transactions plus an error report with one entry per
+    rejected row (its position, the raw record and the validation messages).
+    """
+    records = _frame_records(df)
+    try:
+        return _TRANSACTION_LIST_ADAPTER.validate_python(records), []
+    except ValidationError as e:
+        failures = defaultdict(list)
+        for error in e.errors(include_url=False):
+            row, *field = error["loc"]
+            failures[row].append({"field": ".".join(map(str, field)), "message": error["msg"]})
 
-    return _CACHED_TRANSACTIONS
+    errors = [
+        {"row": row, "record": records[row], "errors": messages}
+        for row, messages in sorted(failures.items())
+    ]
+    valid_records = [record for row, record in enumerate(records) if row not in failures]
+    return _TRANSACTION_LIST_ADAPTER.validate_python(valid_records), errors
+
+
+def load_transactions(
+    file_path: str,
+) -> Tuple[List[Transaction], List[Dict[str, Any]]]:
+    """Parses the export into newest-first transactions plus the rejected-row report."""
+    transactions, errors = build_transactions(read_data_cached(file_path))
+    sort_newest_first(transactions)
+    if errors:
+        logger.error(
+            "🚨 Skipped %d invalid rows (first at row %d): %s",
+            len(errors),
+            errors[0]["row"],
+            errors[0]["errors"],
+        )
+    return transactions, errors
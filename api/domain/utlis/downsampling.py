@@ -0,0 +1,40 @@
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """Positions of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the points between them are
+    split into ``max_points - 2`` buckets and each bucket keeps the point that
+    forms the largest triangle with the point kept before it and the average
+    of the next bucket. Bucket averages are computed with prefix sums, so only
+    the choice of one point per bucket loops in Python.
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket i holds points [edges[i], edges[i + 1]); every bucket is non-empty since n > max_points
+    edges = 1 + np.arange(max_points - 1) * (n - 2) // (max_points - 2)
+    lo, hi = edges[:-1], edges[1:]
+    sum_x = np.concatenate([[0.0], np.cumsum(x)])
+    sum_y = np.concatenate([[0.0], np.cumsum(y)])
+    # Average of the following bucket; the last bucket looks at the last point
+    next_x = np.append(((sum_x[hi] - sum_x[lo]) / (hi - lo))[1:], x[-1])
+    next_y = np.append(((sum_y[hi] - sum_y[lo]) / (hi - lo))[1:], y[-1])
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket, (start, stop) in enumerate(zip(lo, hi)):
+        px, py = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (px - next_x[bucket]) * (y[start:stop] - py)
+            - (px - x[start:stop]) * (next_y[bucket] - py)
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
@@ -0,0 +1,110 @@
+from datetime import date
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+# Period grains accepted by the aggregate endpoints
+PERIODS = ("month", "cycle", "week", "quarter", "year")
+PERIOD_PATTERN = "^(" + "|".join(PERIODS) + ")$"
+
+# Day of month a billing cycle starts on (the UI's salary cycle runs 19th-18th)
+DEFAULT_ANCHOR_DAY = 19
+
+# 1970-01-05 is the first Monday after the datetime64 epoch
+_FIRST_MONDAY = 4
+
+
+def _days(value: Union[date, np.ndarray]) -> np.ndarray:
+    return np.asarray(value, dtype="datetime64[D]")
+
+
+def period_ids(
+    dates: Union[date, np.ndarray], period: str, anchor_day: int = DEFAULT_ANCHOR_DAY
+) -> Union[int, np.ndarray]:
+    """Vectorized period number of each date; numbers increase with time.
+
+    - month / quarter / year: calendar periods counted from 1970
+    - week: ISO week (Monday to Sunday)
+    - cycle: billing cycle from ``anchor_day`` to the day before it next month,
+      numbered by the month it starts in
+    """
+    days = _days(dates)
+    months = days.astype("datetime64[M]").astype(np.int64)
+    if period == "month":
+        ids = months
+    elif period == "quarter":
+        ids = months // 3
+    elif period == "year":
+        ids = months // 12
+    elif period == "week":
+        ids = (days.astype(np.int64) - _FIRST_MONDAY) // 7
+    elif period == "cycle":
+        day_of_month = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+        ids = months - (day_of_month < anchor_day)
+    else:
+        raise ValueError(f"Unknown period: {period}")
+    return int(ids) if ids.ndim == 0 else ids
+
+
+def period_bounds(
+    period_id: int, period: str, anchor_day: int = DEFAULT_ANCHOR_DAY
+) -> Tuple[date, date]:
+    """First and last day (inclusive) of a period number from period_ids."""
+    if period == "week":
+        start = np.datetime64(period_id * 7 + _FIRST_MONDAY, "D")
+        end = start + 6
+    else:
+        months = {"month": 1, "cycle": 1, "quarter": 3, "year": 12}[period]
+        first_month = period_id * months
+        start = np.datetime64(first_month, "M").astype("datetime64[D]")
+        end = np.datetime64(first_month + months, "M").astype("datetime64[D]")
+        if period == "cycle":
+            start, end = start + (anchor_day - 1), end + (anchor_day - 1)
+        end = end - 1
+    return start.astype(date), end.astype(date)
+
+
+def period_label(period_id: int, period: str, anchor_day: int = DEFAULT_ANCHOR_DAY) -> str:
+    """Readable name: 2024-03, 2024-Q1, 2024, 2024-W09; a cycle is named by its last day's month."""
+    start, end = period_bounds(period_id, period, anchor_day)
+    if period == "year":
+        return f"{start.year}"
+    if period == "quarter":
+        return f"{start.year}-Q{(start.month - 1) // 3 + 1}"
+    if period == "week":
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "cycle":
+        return f"{end.year}-{end.month:02d}"
+    return f"{start.year}-{start.month:02d}"
+
+
+def period_info(
+    period_id: int,
+    period: str,
+    anchor_day: int = DEFAULT_ANCHOR_DAY,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> dict:
+    """The fields identifying a period in aggregate responses.
+
+    The bounds of a period cut by the requested ``start_date`` .. ``end_date``
+    range are clamped to it, so they describe the days actually covered.
+    """
+    start, end = period_bounds(period_id, period, anchor_day)
+    return {
+        "period": period_label(period_id, period, anchor_day),
+        "start_date": max(start, start_date or start),
+        "end_date": min(end, end_date or end),
+    }
+
+
+def parse_date_range(text: str) -> Tuple[date, date]:
+    """``YYYY-MM-DD..YYYY-MM-DD`` (inclusive) as a pair of dates."""
+    start, separator, end = text.partition("..")
+    if not separator:
+        raise ValueError(f"Expected a range like 2024-03-19..2024-04-18, got {text!r}")
+    start_date, end_date = date.fromisoformat(start.strip()), date.fromisoformat(end.strip())
+    if start_date > end_date:
+        raise ValueError(f"Range {text!r} ends before it starts")
+    return start_date, end_date
@@ -0,0 +1,70 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate bytes held by a response made of dicts, lists, models and scalars."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return size + sum(estimate_size(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value))
+    return size
+
+
+class ResponseCache:
+    """Small thread-safe LRU of computed responses.
+
+    Keys carry everything a response depends on (dataset and rule versions plus
+    the request parameters), so a new version simply stops hitting old entries.
+    Entries are bounded both in number and in estimated bytes; a response
+    larger than ``max_entry_bytes`` is returned without being cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 4 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = compute()
+        size = estimate_size(value)
+        if size > self.max_entry_bytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,29 @@
+from typing import Dict
+
+import numpy as np
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    cumulative = np.cumsum(values, axis=1)
+    cumulative = np.concatenate([np.zeros((len(values), 1)), cumulative], axis=1)
+    return cumulative[:, window:] - cumulative[:, :-window]
+
+
+def rolling_stats(daily: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """Moving sum, mean and standard deviation along the rows of a dense daily array.
+
+    ``daily`` has one row per series and one column per day. Column ``j`` of
+    each result covers days ``j .. j + window - 1``, so the results have
+    ``window - 1`` fewer columns than ``daily``. The deviation is that of the
+    window's days (zero days included), computed from cumulative sums of values
+    centered on each row's mean to keep the subtraction precise.
+    """
+    sums = _window_sums(daily, window)
+    centered = daily - daily.mean(axis=1, keepdims=True)
+    centered_mean = _window_sums(centered, window) / window
+    variance = _window_sums(centered * centered, window) / window - centered_mean**2
+    return {
+        "sum": sums,
+        "mean": sums / window,
+        "std": np.sqrt(np.clip(variance, 0.0, None)),
+    }
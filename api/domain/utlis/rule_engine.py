@@ -0,0 +1,283 @@
+import json
+import os
+import re
+from collections import deque
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from domain.models.transaction_columns import EncodedColumn
+from domain.utlis.text_folding import fold_text
+
+_RULES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "rules")
+EXCLUSION_RULES_PATH = os.path.join(_RULES_DIR, "exclusion_rules.json")
+CATEGORY_RULES_PATH = os.path.join(_RULES_DIR, "category_rules.json")
+
+
+class ExclusionRules:
+    """clean_data's exclusion rules, compiled into one matcher per column.
+
+    Every value of a column is folded into a single alternation regex, so a row
+    is tested with one lowercase and one search per column no matter how many
+    rules exist, instead of one full pass over the data per rule.
+
+    ``accent_insensitive`` matching uses a second set of patterns built from
+    folded values (see fold_text), run against folded text.
+    """
+
+    def __init__(self, rules: Mapping[str, Iterable[str]], version: Any = None):
+        self.version = version
+        self.rules = {column: list(values) for column, values in rules.items() if values}
+        self.patterns = self._compile(str.lower)
+        self.folded_patterns = self._compile(fold_text)
+
+    def _compile(self, normalize) -> Dict[str, "re.Pattern[str]"]:
+        return {
+            column: re.compile("|".join(re.escape(normalize(value)) for value in values))
+            for column, values in self.rules.items()
+        }
+
+    @classmethod
+    def from_file(cls, path: str = EXCLUSION_RULES_PATH) -> "ExclusionRules":
+        with open(path, encoding="utf-8") as file:
+            config = json.load(file)
+        return cls(config["exclude"], version=config.get("version"))
+
+    def excludes(self, row: Any, accent_insensitive: bool = False) -> bool:
+        """True when any column of ``row`` (an object with the column attributes) matches."""
+        if accent_insensitive:
+            return any(
+                pattern.search(fold_text(str(getattr(row, column, ""))))
+                for column, pattern in self.folded_patterns.items()
+            )
+        return any(
+            pattern.search(str(getattr(row, column, "")).lower())
+            for column, pattern in self.patterns.items()
+        )
+
+    def mask(
+        self,
+        columns: Mapping[str, EncodedColumn],
+        rows: Union[slice, np.ndarray] = slice(None),
+        accent_insensitive: bool = False,
+    ) -> np.ndarray:
+        """Boolean ``excluded`` mask over ``rows``, evaluated once per distinct value."""
+        patterns = self.folded_patterns if accent_insensitive else self.patterns
+        excluded = np.zeros(len(next(iter(columns.values())).codes[rows]), dtype=bool)
+        for column, pattern in patterns.items():
+            excluded |= columns[column].mask_where(
+                lambda text: pattern.search(text) is not None, rows, folded=accent_insensitive
+            )
+        return excluded
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": self.version, "exclude": self.rules}
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over a list of keywords.
+
+    ``first_match`` scans a text once and returns the position (in the keyword
+    list) of the earliest-listed keyword it contains, whatever the number of
+    keywords. Every state stores the lowest keyword id reachable through its
+    failure links, so no output lists are walked during the scan.
+    """
+
+    _NO_MATCH = -1
+
+    def __init__(self, keywords: Sequence[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        first: List[Optional[int]] = [None]
+        for keyword_id, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    first.append(None)
+                state = next_state
+            if first[state] is None:
+                first[state] = keyword_id
+
+        # Breadth-first: a state's failure target is always finished before it
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fail_first = first[self._fail[state]]
+            if fail_first is not None and (first[state] is None or fail_first < first[state]):
+                first[state] = fail_first
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                queue.append(child)
+        self._first = [self._NO_MATCH if value is None else value for value in first]
+
+    def first_match(self, text: str) -> int:
+        """Lowest id of the keywords contained in ``text``, or -1."""
+        goto, fail, first = self._goto, self._fail, self._first
+        best = self._NO_MATCH
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found = first[state]
+            if found != self._NO_MATCH and (best == self._NO_MATCH or found < best):
+                best = found
+                if best == 0:
+                    break
+        return best
+
+
+class ExpenseCategorizer:
+    """categorize_expense's rule table, compiled once into an Aho-Corasick automaton.
+
+    A stored category listed in ``categories`` maps straight to its expense
+    category; otherwise the first keyword of ``keywords`` (file order wins)
+    contained in the lowercased text decides, and ``default`` is the fallback.
+
+    Results are memoized per distinct (description, category) pair for the
+    lifetime of the instance; merchants repeat far more often than they vary.
+    The memo also records which rule decided each pair, so ``carry_over`` can
+    keep every entry a rule edit cannot have changed.
+
+    With ``accent_insensitive`` keywords and text are compared folded (see
+    fold_text), so "Tiết kiệm" also matches "TIET KIEM".
+    """
+
+    # Rule ids recorded in the memo besides keyword positions
+    _BY_DEFAULT = -1
+    _BY_CATEGORY = -2
+
+    def __init__(
+        self,
+        keywords: Sequence[Tuple[str, str]],
+        categories: Optional[Mapping[str, str]] = None,
+        default: str = "Others",
+        version: Any = None,
+        accent_insensitive: bool = False,
+    ):
+        self.version = version
+        self.keywords = [(keyword, category) for keyword, category in keywords]
+        self.categories = dict(categories or {})
+        self.default = default
+        self.accent_insensitive = accent_insensitive
+        self._normalize = fold_text if accent_insensitive else str.lower
+        self._labels = [category for _, category in self.keywords]
+        self._automaton = AhoCorasick([self._normalize(keyword) for keyword, _ in self.keywords])
+        self._memo: Dict[Tuple[Any, Any], Tuple[str, int]] = {}
+        self._variant: Optional["ExpenseCategorizer"] = None
+
+    @classmethod
+    def from_file(cls, path: str = CATEGORY_RULES_PATH) -> "ExpenseCategorizer":
+        with open(path, encoding="utf-8") as file:
+            config = json.load(file)
+        return cls(
+            config["keywords"],
+            categories=config.get("categories"),
+            default=config.get("default", "Others"),
+            version=config.get("version"),
+            accent_insensitive=config.get("accent_insensitive", False),
+        )
+
+    def with_accent_insensitive(self, accent_insensitive: bool) -> "ExpenseCategorizer":
+        """These rules in the requested matching mode; the other mode is compiled once."""
+        if accent_insensitive == self.accent_insensitive:
+            return self
+        if self._variant is None:
+            self._variant = ExpenseCategorizer(
+                self.keywords,
+                categories=self.categories,
+                default=self.default,
+                version=self.version,
+                accent_insensitive=accent_insensitive,
+            )
+        return self._variant
+
+    def _decide(self, description: Any, category: Any) -> Tuple[str, int]:
+        if category in self.categories:
+            return self.categories[category], self._BY_CATEGORY
+        keyword_id = self._automaton.first_match(self._normalize(str(description)))
+        if keyword_id < 0:
+            return self.default, self._BY_DEFAULT
+        return self._labels[keyword_id], keyword_id
+
+    def categorize(self, description: Any, category: Any = None) -> str:
+        return self._decide(description, category)[0]
+
+    def categorize_many(
+        self,
+        descriptions: Iterable[Any],
+        categories: Optional[Iterable[Any]] = None,
+        memo: Optional[Dict[Tuple[Any, Any], Tuple[str, int]]] = None,
+    ) -> List[str]:
+        """Categorizes a whole column, scanning each distinct (description, category) once.
+
+        ``memo`` replaces the instance memo, e.g. for data that should not stay cached.
+        """
+        if categories is None:
+            categories = repeat(None)
+        if memo is None:
+            memo = self._memo
+        result = []
+        for pair in zip(descriptions, categories):
+            decided = memo.get(pair)
+            if decided is None:
+                decided = memo[pair] = self._decide(*pair)
+            result.append(decided[0])
+        return result
+
+    def carry_over(self, previous: "ExpenseCategorizer") -> int:
+        """Copies the memo entries of ``previous`` that these rules categorize identically.
+
+        Keywords form a first-match-wins list, so a pair decided by a keyword
+        before the first edited position keeps its category; pairs decided later,
+        by the default, or through an edited stored-category mapping are left out
+        and recomputed on demand. Returns the number of entries kept.
+        """
+        if self.accent_insensitive != previous.accent_insensitive:
+            return 0
+        prefix = 0
+        for old, new in zip(previous.keywords, self.keywords):
+            if (old[0].lower(), old[1]) != (new[0].lower(), new[1]):
+                break
+            prefix += 1
+        unmatched_changed = (
+            prefix < len(self.keywords)
+            or prefix < len(previous.keywords)
+            or self.default != previous.default
+        )
+        edited_categories = {
+            category
+            for category in {*self.categories, *previous.categories}
+            if self.categories.get(category) != previous.categories.get(category)
+        }
+
+        kept = 0
+        for pair, decided in previous._memo.items():
+            rule = decided[1]
+            if pair[1] in edited_categories:
+                continue
+            if rule == self._BY_DEFAULT and unmatched_changed:
+                continue
+            if rule >= prefix:
+                continue
+            self._memo[pair] = decided
+            kept += 1
+        return kept
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "categories": self.categories,
+            "keywords": self.keywords,
+            "default": self.default,
+            "accent_insensitive": self.accent_insensitive,
+        }
@@ -0,0 +1,91 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Union
+
+import numpy as np
+
+from domain.models.transaction_columns import EncodedColumn
+from domain.utlis.text_folding import fold_text
+
+SEARCH_FIELDS = ("description", "category", "transaction_code", "counter_account")
+
+_GRAM = 3
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+class TrigramIndex:
+    """Inverted trigram index over a table of lowercased strings.
+
+    ``matches`` intersects the posting lists of the query's trigrams and only
+    runs the substring check on the surviving candidates.
+    """
+
+    def __init__(self, values: Sequence[str]):
+        self._values = values
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for value_id, value in enumerate(values):
+            for gram in _trigrams(value):
+                postings[gram].append(value_id)
+        self._postings = {
+            gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()
+        }
+
+    def matches(self, text: str) -> np.ndarray:
+        """Ids of the values containing ``text`` (already lowercased)."""
+        if len(text) < _GRAM:
+            candidates = range(len(self._values))
+        else:
+            lists = sorted(
+                (self._postings.get(gram) for gram in _trigrams(text)),
+                key=lambda ids: -1 if ids is None else len(ids),
+            )
+            if lists[0] is None:
+                return np.empty(0, dtype=np.int32)
+            candidates = lists[0]
+            for ids in lists[1:]:
+                candidates = np.intersect1d(candidates, ids, assume_unique=True)
+                if not len(candidates):
+                    break
+        return np.fromiter(
+            (value_id for value_id in candidates if text in self._values[value_id]),
+            dtype=np.int32,
+        )
+
+
+class SearchIndex:
+    """Search over the free-text transaction fields, built once per loaded dataset.
+
+    Each field is dictionary encoded, so the trigram index covers distinct
+    values only and a match is broadcast back to rows through the codes.
+    A second index over the folded values serves accent-insensitive search.
+    """
+
+    def __init__(self, columns: Dict[str, EncodedColumn]):
+        self._columns = {field: columns[field] for field in SEARCH_FIELDS}
+        self._indexes = {
+            field: TrigramIndex(column.lowered) for field, column in self._columns.items()
+        }
+        self._folded_indexes = {
+            field: TrigramIndex(column.folded) for field, column in self._columns.items()
+        }
+
+    def search(
+        self,
+        text: str,
+        rows: Union[slice, np.ndarray] = slice(None),
+        accent_insensitive: bool = False,
+    ) -> np.ndarray:
+        """Boolean mask over ``rows``: any search field contains ``text`` (case-insensitive)."""
+        if accent_insensitive:
+            text, indexes = fold_text(text), self._folded_indexes
+        else:
+            text, indexes = text.lower(), self._indexes
+        mask = None
+        for field, column in self._columns.items():
+            hits = np.zeros(len(column.values), dtype=bool)
+            hits[indexes[field].matches(text)] = True
+            field_mask = hits[column.codes[rows]]
+            mask = field_mask if mask is None else mask | field_mask
+        return mask
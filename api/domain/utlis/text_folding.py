@@ -0,0 +1,12 @@
+import unicodedata
+from functools import lru_cache
+
+# "đ" is a letter of its own, not "d" plus a combining mark, so NFD keeps it
+_VIETNAMESE_D = str.maketrans({"đ": "d", "Đ": "D"})
+
+
+@lru_cache(maxsize=65536)
+def fold_text(text: str) -> str:
+    """Casefolds ``text`` and strips Vietnamese accents: "Tiết kiệm Điện tử" -> "tiet kiem dien tu"."""
+    decomposed = unicodedata.normalize("NFD", text.translate(_VIETNAMESE_D).casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
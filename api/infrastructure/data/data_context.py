@@ -0,0 +1,172 @@
+import logging
+import threading
+from typing import List, NamedTuple, Optional
+
+from adapters.repositories.sqlite_repository import (
+    SqliteTransactionRepository,
+    database_is_current,
+    import_excel,
+    read_transactions,
+)
+from adapters.repositories.transaction_repository import (
+    ColumnarTransactionRepository,
+    TransactionRepository,
+)
+from adapters.repositories_interface.generic_repository_interface import (
+    IGenericRepository,
+)
+from domain.config import Settings
+from domain.models.dataset_snapshot import DatasetSnapshot
+from domain.models.transaction import Transaction
+from domain.utlis.csv_reader import _FILE_PATH, load_transactions
+from domain.utlis.rule_engine import CATEGORY_RULES_PATH, ExpenseCategorizer
+from infrastructure.data.file_watcher import FileWatcher
+
+logger = logging.getLogger("uvicorn")
+
+
+class DataView(NamedTuple):
+    """A snapshot together with the repository that reads it."""
+
+    snapshot: DatasetSnapshot
+    repository: IGenericRepository[Transaction]
+
+
+class DataContext:
+    """Application-scoped owner of the current dataset snapshot.
+
+    Created once in the FastAPI lifespan hook. Requests take ``current`` once and
+    keep that reference, so every request works on one consistent snapshot.
+    """
+
+    def __init__(
+        self,
+        file_path: str = _FILE_PATH,
+        repository_backend: str = "memory",
+        sqlite_path: Optional[str] = None,
+        reload_interval: float = 0,
+        category_rules_path: str = CATEGORY_RULES_PATH,
+    ):
+        self.file_path = file_path
+        self.repository_backend = repository_backend
+        self.sqlite_path = sqlite_path
+        self.reload_interval = reload_interval
+        self.category_rules_path = category_rules_path
+        self.categorizer = ExpenseCategorizer.from_file(category_rules_path)
+        self._current: Optional[DataView] = None
+        self._load_lock = threading.Lock()
+        self._watchers: List[FileWatcher] = []
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DataContext":
+        return cls(
+            file_path=settings.data_file_path or _FILE_PATH,
+            repository_backend=settings.repository_backend,
+            sqlite_path=settings.sqlite_path,
+            reload_interval=settings.reload_interval_seconds,
+            category_rules_path=settings.category_rules_path or CATEGORY_RULES_PATH,
+        )
+
+    @property
+    def current(self) -> DataView:
+        if self._current is None:
+            self.load()
+        return self._current
+
+    def _repository(self, snapshot: DatasetSnapshot) -> IGenericRepository[Transaction]:
+        if self.repository_backend == "sqlite":
+            return SqliteTransactionRepository(self.sqlite_path, self.file_path)
+        if self.repository_backend == "columnar":
+            return ColumnarTransactionRepository(
+                snapshot.columns,
+                snapshot.search_index,
+                snapshot.derived.excluded,
+                snapshot.derived.excluded_folded,
+            )
+        return TransactionRepository(
+            snapshot.transactions,
+            snapshot.search_index,
+            snapshot.derived.excluded,
+            snapshot.derived.excluded_folded,
+        )
+
+    def _read_transactions(self, version: int):
+        """Rows of the next snapshot: from the shared SQLite import, or parsed from the export.
+
+        With the sqlite backend the export is only parsed (once, by whichever
+        worker gets there first) when the database is stale; every worker then
+        reads all rows of the same on-disk dataset into its own snapshot. This
+        saves the parse, not memory: only list/search queries run in SQLite.
+        """
+        if self.repository_backend == "sqlite":
+            if not database_is_current(self.sqlite_path, self.file_path):
+                import_excel(self.file_path, self.sqlite_path)
+            logger.info("📂 Loading transactions v%d from %s", version, self.sqlite_path)
+            return read_transactions(self.sqlite_path)
+        logger.info("📂 Loading transactions v%d from %s", version, self.file_path)
+        return load_transactions(self.file_path)
+
+    def load(self) -> DataView:
+        """Builds a complete new snapshot off the request path and publishes it.
+
+        Publishing is a single reference swap (RCU style): requests that already
+        hold the previous view finish on it untouched, new requests get the new one.
+        If loading fails the previous snapshot stays current.
+        """
+        with self._load_lock:
+            version = self._current.snapshot.version + 1 if self._current else 1
+            transactions, errors = self._read_transactions(version)
+            snapshot = DatasetSnapshot.build(
+                transactions,
+                version=version,
+                source_path=self.file_path,
+                load_errors=errors,
+                categorizer=self.categorizer,
+                previous=self._current.snapshot if self._current else None,
+            )
+            self._current = DataView(snapshot, self._repository(snapshot))
+            logger.info("⚡ Transactions v%d ready (%d items)", version, len(transactions))
+            return self._current
+
+    def reload_rules(self) -> None:
+        """Recompiles the category rule file and publishes recategorized data.
+
+        Memo entries the edit cannot affect are carried over, so only the changed
+        (counter_account, category) pairs are categorized again. The file's
+        ``version`` must change; cached responses are keyed by it.
+        """
+        with self._load_lock:
+            categorizer = ExpenseCategorizer.from_file(self.category_rules_path)
+            previous = self.categorizer
+            if categorizer.version == previous.version:
+                logger.warning(
+                    "⚠️ %s changed but its version is still %s, keeping current rules",
+                    self.category_rules_path,
+                    previous.version,
+                )
+                return
+            kept = categorizer.carry_over(previous)
+            self.categorizer = categorizer
+            if self._current is not None:
+                snapshot = self._current.snapshot.with_categorizer(categorizer)
+                self._current = DataView(snapshot, self._current.repository)
+            logger.info(
+                "🏷️ Category rules v%s ready (%d memoized categories kept)",
+                categorizer.version,
+                kept,
+            )
+
+    def start_watching(self) -> None:
+        """Reloads in the background whenever the source file or the rule file changes."""
+        if self.reload_interval > 0 and not self._watchers:
+            self._watchers = [
+                FileWatcher(self.file_path, self.load, self.reload_interval),
+                FileWatcher(self.category_rules_path, self.reload_rules, self.reload_interval),
+            ]
+            for watcher in self._watchers:
+                watcher.start()
+
+    def stop_watching(self) -> None:
+        for watcher in self._watchers:
+            watcher.stop()
+        self._watchers = []
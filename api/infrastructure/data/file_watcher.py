@@ -0,0 +1,59 @@
+import logging
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger("uvicorn")
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """Polls a file's mtime and size on a daemon thread and calls ``on_change``.
+
+    A change is only reported once two consecutive polls agree, so a workbook
+    that is still being written is not picked up half-way.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], None], interval: float = 5.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"file-watcher:{self.path}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        seen = _stat_key(self.path)
+        pending = None
+        while not self._stop.wait(self.interval):
+            current = _stat_key(self.path)
+            if current is None or current == seen:
+                pending = None
+                continue
+            if current != pending:
+                pending = current
+                continue
+
+            seen, pending = current, None
+            logger.info("🔄 Detected change in %s", self.path)
+            try:
+                self.on_change()
+            except Exception as e:
+                logger.error(f"🚨 Reload of {self.path} failed, keeping current data: {e}")
@@ -1,4 +1,8 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from domain.config import get_settings
+from infrastructure.data.data_context import DataContext
 from infrastructure.middleware.global_exception_middleware import (
     GlobalExceptionMiddleware,
 )
@@ -16,7 +20,18 @@ logging.basicConfig(
 
 logger = logging.getLogger("uvicorn")
 
-app = FastAPI(title="Finance API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One dataset snapshot for the whole process, shared by reference with requests
+    app.state.data_context = DataContext.from_settings(get_settings())
+    app.state.data_context.load()
+    app.state.data_context.start_watching()
+    yield
+    app.state.data_context.stop_watching()
+
+
+app = FastAPI(title="Finance API", lifespan=lifespan)
 
 # Register the middleware
 app.add_middleware(GlobalExceptionMiddleware)
@@ -1,12 +1,24 @@
-from fastapi import Depends
-from adapters.repositories.transaction_repository import TransactionRepository
+from fastapi import Depends, Request
 from domain.interfaces.transaction_service_interface import ITransactionService
+from domain.services.categorization_service import CategorizationService
 from domain.services.transaction_service import TransactionService
+from infrastructure.data.data_context import DataView
+
+
+def get_data_view(request: Request) -> DataView:
+    """The snapshot (and its repository) this request works on."""
+    return request.app.state.data_context.current
 
-def get_transaction_repository() -> TransactionRepository:
-    return TransactionRepository()  
 
 def get_transaction_service(
-    repository: TransactionRepository = Depends(get_transaction_repository),
+    view: DataView = Depends(get_data_view),
 ) -> ITransactionService:
-    return TransactionService(repository)
\ No newline at end of file
+    return TransactionService(view.repository, view.snapshot)
+
+
+def get_categorization_service(
+    request: Request, accent_insensitive: bool = False
+) -> CategorizationService:
+    """Categorizes with the rules currently loaded by the data context."""
+    categorizer = request.app.state.data_context.categorizer
+    return CategorizationService(categorizer.with_accent_insensitive(accent_insensitive))
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from presentation.v1.endpoints import transactions, health
+from presentation.v1.endpoints import categorize, transactions, health
 
 
 api_router = APIRouter()
@@ -8,4 +8,7 @@ api_router = APIRouter()
 api_router.include_router(
     transactions.router, prefix="/transactions", tags=["Transactions"]
 )
+api_router.include_router(
+    categorize.router, prefix="/categorize", tags=["Categorization"]
+)
 api_router.include_router(health.router, prefix="/health", tags=["health-check"])
@@ -0,0 +1,117 @@
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+
+from domain.models.categorization import CategorizationRecord, CategorizedRecord
+from domain.services.categorization_service import BATCH_SIZE, CategorizationService
+from presentation.dependencies import get_categorization_service
+
+router = APIRouter()
+
+NDJSON = "application/x-ndjson"
+RULES_VERSION_HEADER = "X-Category-Rules-Version"
+
+_RECORD_LIST_ADAPTER = TypeAdapter(List[CategorizationRecord])
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    """Non-empty lines of the request body, read as it arrives."""
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if pending.strip():
+        yield pending
+
+
+async def _read_ndjson(request: Request) -> List[Union[CategorizationRecord, Dict[str, Any]]]:
+    """Records of an NDJSON body; an invalid line becomes an error entry in its place."""
+    items: List[Union[CategorizationRecord, Dict[str, Any]]] = []
+    line_number = 0
+    async for line in _ndjson_lines(request):
+        line_number += 1
+        try:
+            items.append(
+                CategorizationRecord.model_validate_json(line.decode("utf-8", "replace"))
+            )
+        except ValidationError as e:
+            items.append(
+                {
+                    "line": line_number,
+                    "errors": e.errors(include_url=False, include_context=False),
+                }
+            )
+    return items
+
+
+def _categorize_ndjson(
+    items: List[Union[CategorizationRecord, Dict[str, Any]]], service: CategorizationService
+) -> Iterable[str]:
+    for start in range(0, len(items), BATCH_SIZE):
+        chunk = items[start : start + BATCH_SIZE]
+        categorized = iter(
+            service.categorize_batch(
+                [item for item in chunk if isinstance(item, CategorizationRecord)]
+            )
+        )
+        yield "".join(
+            (
+                next(categorized).model_dump_json()
+                if isinstance(item, CategorizationRecord)
+                else json.dumps(item, ensure_ascii=False, default=str)
+            )
+            + "\n"
+            for item in chunk
+        )
+
+
+def _categorize_list(
+    records: List[CategorizationRecord], service: CategorizationService
+) -> Iterable[str]:
+    yield "["
+    for start in range(0, len(records), BATCH_SIZE):
+        categorized = service.categorize_batch(records[start : start + BATCH_SIZE])
+        yield ("," if start else "") + ",".join(
+            record.model_dump_json() for record in categorized
+        )
+    yield "]"
+
+
+@router.post(
+    "",
+    response_model=List[CategorizedRecord],
+    responses={200: {"content": {NDJSON: {}}}},
+)
+async def categorize(
+    request: Request,
+    service: CategorizationService = Depends(get_categorization_service),
+):
+    """Categorize records with the loaded category rules.
+
+    Send a JSON list of {description, counter_account, category}, or one record
+    per line with Content-Type application/x-ndjson to get NDJSON back.
+    ``accent_insensitive=true`` also matches keywords written without accents.
+    """
+    headers = {RULES_VERSION_HEADER: str(service.rules_version)}
+    if request.headers.get("content-type", "").startswith(NDJSON):
+        return StreamingResponse(
+            _categorize_ndjson(await _read_ndjson(request), service),
+            media_type=NDJSON,
+            headers=headers,
+        )
+
+    try:
+        records = _RECORD_LIST_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422, detail=e.errors(include_url=False, include_context=False)
+        )
+    return StreamingResponse(
+        _categorize_list(records, service), media_type="application/json", headers=headers
+    )
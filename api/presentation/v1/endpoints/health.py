@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from domain.config import get_settings
 
 settings = get_settings()
@@ -7,9 +7,18 @@ router = APIRouter()
 
 
 @router.get("/")
-def health_check():
+def health_check(request: Request):
+    snapshot = request.app.state.data_context.current.snapshot
     return {
         "app_name": settings.app_name,
         "env": settings.environment,
         "debug": settings.debug,
+        "dataset": {
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at,
+            "source": snapshot.source_path,
+            "transactions": len(snapshot.transactions),
+            "rejected_rows": len(snapshot.load_errors),
+            "category_rules_version": snapshot.rules_version,
+        },
     }
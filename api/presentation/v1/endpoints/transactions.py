@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends
 from datetime import date
 from typing import List, Dict, Any, Optional
-from domain.interfaces.transaction_service_interface import ITransactionService
+from domain.interfaces.transaction_service_interface import (
+    DASHBOARD_SECTIONS,
+    ROLLING_MAX_DAYS,
+    ITransactionService,
+)
 from presentation.dependencies import get_transaction_service
 from domain.models.transaction import Transaction
+from domain.utlis.aggregation import measure_names, parse_group_by, parse_measures
+from domain.utlis.periods import DEFAULT_ANCHOR_DAY, PERIOD_PATTERN, PERIODS, parse_date_range
 
 router = APIRouter()
 
@@ -18,10 +24,12 @@ def list_transactions(
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
     clean: bool = False,
+    accent_insensitive: bool = False,
     service: ITransactionService = Depends(get_transaction_service),
 ):
     """Retrieve transactions with optional filters and sorting.
     limit = -1 => all of transacitons
+    accent_insensitive => search and clean ignore case and Vietnamese accents
     """
     return service.get_transactions(
         query=search,
@@ -32,6 +40,7 @@ def list_transactions(
         start_date=start_date,
         end_date=end_date,
         clean=clean,
+        accent_insensitive=accent_insensitive,
     )
 
 
@@ -39,12 +48,18 @@ def list_transactions(
 def analyze_income_expenditure(
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
+    period: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+    anchor_day: int = Query(DEFAULT_ANCHOR_DAY, ge=1, le=28),
     service: ITransactionService = Depends(get_transaction_service),
 ):
-    """Analyze and return income vs. expenditure statistics."""
+    """Analyze and return income vs. expenditure statistics.
+    period => month | cycle | week | quarter | year; cycle runs from anchor_day to the day before it
+    """
     return service.income_expenditure_analysis(
         start_date=start_date,
         end_date=end_date,
+        period=period,
+        anchor_day=anchor_day,
     )
 
 
@@ -52,12 +67,16 @@ def analyze_income_expenditure(
 def get_transaction_overview(
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
+    period: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+    anchor_day: int = Query(DEFAULT_ANCHOR_DAY, ge=1, le=28),
     service: ITransactionService = Depends(get_transaction_service),
 ):
     """Generate an overview section for transactions."""
     return service.generate_overview_section(
         start_date=start_date,
         end_date=end_date,
+        period=period,
+        anchor_day=anchor_day,
     )
 
 
@@ -65,12 +84,16 @@ def get_transaction_overview(
 def get_investment(
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
+    accent_insensitive: bool = False,
     service: ITransactionService = Depends(get_transaction_service),
 ):
-    """Generate an overview section for transactions."""
+    """Generate an overview section for transactions.
+    accent_insensitive => description keywords match ignoring case and Vietnamese accents
+    """
     return service.get_investment(
         start_date=start_date,
         end_date=end_date,
+        accent_insensitive=accent_insensitive,
     )
 
 
@@ -78,12 +101,16 @@ def get_investment(
 def get_saving(
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
+    accent_insensitive: bool = False,
     service: ITransactionService = Depends(get_transaction_service),
 ):
-    """Generate an overview section for transactions."""
+    """Generate an overview section for transactions.
+    accent_insensitive => description keywords match ignoring case and Vietnamese accents
+    """
     return service.get_saving(
         start_date=start_date,
         end_date=end_date,
+        accent_insensitive=accent_insensitive,
     )
 
 
@@ -106,14 +133,22 @@ def get_balance_trends(
     offset: int = Query(0, ge=0),
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
+    period: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+    anchor_day: int = Query(DEFAULT_ANCHOR_DAY, ge=1, le=28),
+    max_points: Optional[int] = Query(None, ge=3),
     service: ITransactionService = Depends(get_transaction_service),
 ):
-    """Retrieve balance trends over time."""
+    """Retrieve balance trends over time.
+    max_points => downsample long series to at most this many points (LTTB)
+    """
     return service.balance_trends(
         start_date=start_date,
         end_date=end_date,
         limit=limit,
         offset=offset,
+        period=period,
+        anchor_day=anchor_day,
+        max_points=max_points,
     )
 
 @router.get("/expense-tree", response_model=List[Dict[str, Any]])
@@ -122,12 +157,191 @@ def expense_tree(
     offset: int = Query(0, ge=0),
     start_date: Optional[date] = "2023-01-01",
     end_date: Optional[date] = "2025-12-31",
+    period: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+    anchor_day: int = Query(DEFAULT_ANCHOR_DAY, ge=1, le=28),
     service: ITransactionService = Depends(get_transaction_service),
 ):
-    """Retrieve balance trends over time."""
+    """Debit totals per expense category.
+    limit, offset => page the category entries (every transaction in range is counted)
+    """
     return service.expense_tree(
         start_date=start_date,
         end_date=end_date,
         limit=limit,
         offset=offset,
+        period=period,
+        anchor_day=anchor_day,
+    )
+
+
+@router.get("/expense-treemap", response_model=List[Dict[str, Any]])
+def get_expense_treemap(
+    start_date: Optional[date] = "2023-01-01",
+    end_date: Optional[date] = "2025-12-31",
+    by_month: bool = False,
+    top_n: int = Query(10, ge=-1),
+    clean: bool = True,
+    service: ITransactionService = Depends(get_transaction_service),
+):
+    """Debits as a tree: expense category -> counter account (-> month when by_month).
+    Rows without a counter account are left out, as in /expense-tree.
+    top_n => children kept per node, the rest are merged into "Others"; -1 => keep all
+    """
+    return service.expense_treemap(
+        start_date=start_date,
+        end_date=end_date,
+        by_month=by_month,
+        top_n=top_n,
+        clean=clean,
+    )
+
+
+@router.get("/dashboard", response_model=Dict[str, Any])
+def get_dashboard(
+    start_date: Optional[date] = "2023-01-01",
+    end_date: Optional[date] = "2025-12-31",
+    sections: Optional[str] = None,
+    top_n: int = Query(4, ge=1),
+    category: List[str] = Query([]),
+    service: ITransactionService = Depends(get_transaction_service),
+):
+    """Dashboard sections for one date range in a single call.
+    sections => comma separated subset of overview, summary, income_expenditure,
+    balance_trends, top_debits, latest, category_top, expense_tree (default: all)
+    category => search term for category_top, repeatable
+    """
+    selected = [name.strip() for name in sections.split(",") if name.strip()] if sections else None
+    unknown = sorted(set(selected or ()) - set(DASHBOARD_SECTIONS))
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown dashboard sections: {', '.join(unknown)}"
+        )
+    return service.dashboard(
+        start_date=start_date,
+        end_date=end_date,
+        sections=selected,
+        top_n=top_n,
+        categories=category,
+    )
+
+
+@router.get("/rolling", response_model=Dict[str, Any])
+def get_rolling(
+    start_date: Optional[date] = "2023-01-01",
+    end_date: Optional[date] = "2025-12-31",
+    window: List[int] = Query([7, 30, 90]),
+    measure: str = Query("debit", pattern="^(debit|credit|net_flow)$"),
+    by_category: bool = False,
+    service: ITransactionService = Depends(get_transaction_service),
+):
+    """Rolling 7/30/90-day (or any window) sums, averages and deviations per day.
+    window => window length in days, repeatable
+    by_category => one series per expense category with transactions in the range
+    start_date..end_date => at most ROLLING_MAX_DAYS (3 * 366) days
+    """
+    if any(days < 1 or days > 366 for days in window):
+        raise HTTPException(status_code=422, detail="window must be between 1 and 366 days")
+    if start_date and end_date and (end_date - start_date).days >= ROLLING_MAX_DAYS:
+        raise HTTPException(
+            status_code=422, detail=f"date range must not exceed {ROLLING_MAX_DAYS} days"
+        )
+    return service.rolling(
+        start_date=start_date,
+        end_date=end_date,
+        windows=window,
+        measure=measure,
+        by_category=by_category,
+    )
+
+
+@router.get("/aggregate", response_model=Dict[str, Any])
+def get_aggregate(
+    start_date: Optional[date] = "2023-01-01",
+    end_date: Optional[date] = "2025-12-31",
+    group_by: str = "",
+    measures: str = "sum:debit,sum:credit,count",
+    search: Optional[str] = None,
+    clean: bool = False,
+    accent_insensitive: bool = False,
+    expense_category: List[str] = Query([]),
+    counter_account: List[str] = Query([]),
+    anchor_day: int = Query(DEFAULT_ANCHOR_DAY, ge=1, le=28),
+    sort_by: Optional[str] = None,
+    limit: int = Query(-1, ge=-1),
+    service: ITransactionService = Depends(get_transaction_service),
+):
+    """Group transactions and compute measures, returned as columnar arrays.
+    group_by => comma separated: month | cycle | week | quarter | year (at most one),
+                category, expense_category, counter_account, transaction_code
+    measures => comma separated: count or <sum|mean|min|max|p0..p100>:<debit|credit|net_flow>
+    sort_by => one of the measures, largest first, or one of the group_by fields;
+               limit = -1 => all groups
+    """
+    try:
+        fields = parse_group_by(group_by)
+        parsed_measures = parse_measures(measures)
+        sortable = [*fields, *measure_names(parsed_measures)]
+        if sort_by is not None and sort_by not in sortable:
+            raise ValueError(f"sort_by must be one of: {', '.join(sortable)}")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return service.aggregate(
+        start_date=start_date,
+        end_date=end_date,
+        group_by=fields,
+        measures=parsed_measures,
+        query=search,
+        clean=clean,
+        accent_insensitive=accent_insensitive,
+        expense_categories=expense_category,
+        counter_accounts=counter_account,
+        anchor_day=anchor_day,
+        sort_by=sort_by,
+        limit=limit,
+    )
+
+
+@router.get("/compare", response_model=Dict[str, Any])
+def get_compare(
+    base: Optional[str] = None,
+    target: Optional[str] = None,
+    period: Optional[str] = Query(None, pattern=PERIOD_PATTERN),
+    periods: int = Query(1, ge=1, le=120),
+    end_date: Optional[date] = None,
+    anchor_day: int = Query(DEFAULT_ANCHOR_DAY, ge=1, le=28),
+    group_by: str = "expense_category",
+    measures: str = "sum:debit",
+    clean: bool = True,
+    service: ITransactionService = Depends(get_transaction_service),
+):
+    """Compare measures per group between periods.
+    base, target => date ranges like 2024-02-19..2024-03-18
+    period, periods => instead of base/target: the last `periods` periods (ending with the one
+                       holding end_date, default the newest transaction), each against the one before
+    group_by => comma separated category, expense_category, counter_account, transaction_code
+    measures => comma separated: count or <sum|mean>:<debit|credit|net_flow>
+    """
+    try:
+        fields = parse_group_by(group_by)
+        parsed_measures = parse_measures(measures)
+        if any(field in PERIODS for field in fields):
+            raise ValueError("group_by takes text fields only; use period to pick the periods")
+        if any(function not in ("count", "sum", "mean") for function, _ in parsed_measures):
+            raise ValueError("compare supports the count, sum and mean measures")
+        if period is None and (base is None or target is None):
+            raise ValueError("Give either base and target ranges or a period")
+        base_range = parse_date_range(base) if period is None else None
+        target_range = parse_date_range(target) if period is None else None
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return service.compare(
+        group_by=fields,
+        measures=parsed_measures,
+        base=base_range,
+        target=target_range,
+        period=period,
+        periods=periods,
+        end_date=end_date,
+        anchor_day=anchor_day,
+        clean=clean,
     )
@@ -1,7 +1,7 @@
 import pandas as pd
 import plotly.graph_objs as go
 
-from utils.util_methods import categorize_expense
+from utils.util_methods import categorize_expenses
 import plotly.express as px
 
 
@@ -10,46 +10,13 @@ class highlight_service:
         df["transaction_date"] = pd.to_datetime(df["transaction_date"], errors="coerce")
         self.df = df
 
-    def expense_category_tree_map(self):
-        # Clean the DataFrame by dropping NaN values
-        df = self.df[self.df["debit"].notna()].copy()
-        df = self.df[self.df["counter_account"].notna()].copy()
-        df = self.df[self.df["category"].notna()].copy()
-
-        # Identify the index of rows to drop
-        index_to_drop = df[df["category"] == "saving"].index
-
-        # Drop the rows
-        df.drop(index=index_to_drop, inplace=True)
-
-        df["Expense Category"] = df.apply(
-            lambda row: categorize_expense(row["counter_account"], row["category"]),
-            axis=1,
-        )
-
-        # Group by 'Expense Category' and sum the 'debit' amounts
-        category_summary = df.groupby("Expense Category")["debit"].sum().reset_index()
-
-        # Create the treemap
-        fig = px.treemap(
-            category_summary,
-            path=["Expense Category"],
-            values="debit",
-            title="Phân bố chi phí theo nhóm",
-        )
-
-        return fig
-
     def expense_category_column_shorter(self):
         # Clean the DataFrame by dropping NaN values
         df = self.df[self.df["debit"].notna()].copy()
         df = self.df[self.df["counter_account"].notna()].copy()
         df = self.df[self.df["category"].notna()].copy()
 
-        df["Expense Category"] = df.apply(
-            lambda row: categorize_expense(row["counter_account"], row["category"]),
-            axis=1,
-        )
+        df["Expense Category"] = categorize_expenses(df)
 
         # Group by 'Expense Category' and sum the 'debit' amounts
         category_summary = df.groupby("Expense Category")["debit"].sum().reset_index()
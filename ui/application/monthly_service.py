@@ -1,7 +1,4 @@
 import plotly.graph_objs as go
-from utils.util_methods import (
-    categorize_expense,
-)
 import pandas as pd
 
 # from datetime import datetime
@@ -403,29 +400,3 @@ class monthly_service:
             }
         )
         return table_data
-
-    def expense_category_tree_map(self):
-        # Clean the DataFrame by dropping NaN values
-        month_df = self.month_df[self.month_df["debit"].notna()].copy()
-        month_df = self.month_df[self.month_df["counter_account"].notna()].copy()
-        month_df = self.month_df[self.month_df["category"].notna()].copy()
-
-        month_df["Expense Category"] = month_df.apply(
-            lambda row: categorize_expense(row["counter_account"], row["category"]),
-            axis=1,
-        )
-
-        # Group by 'Expense Category' and sum the 'debit' amounts
-        category_summary = (
-            month_df.groupby("Expense Category")["debit"].sum().reset_index()
-        )
-
-        # Create the treemap
-        fig = px.treemap(
-            category_summary,
-            path=["Expense Category"],
-            values="debit",
-            title="Phân bố chi phí theo nhóm",
-        )
-
-        return fig
@@ -0,0 +1,28 @@
+import plotly.graph_objects as go
+
+
+def make_treemap(tree, title):
+    """Plotly treemap from the nested {name, size, children} nodes of /expense-treemap."""
+    ids, labels, parents, values = [], [], [], []
+
+    def add(nodes, parent):
+        for node in nodes:
+            node_id = f"{parent}/{node['name']}" if parent else node["name"]
+            ids.append(node_id)
+            labels.append(node["name"])
+            parents.append(parent)
+            values.append(node["size"])
+            add(node.get("children", []), node_id)
+
+    add(tree or [], "")
+    fig = go.Figure(
+        go.Treemap(
+            ids=ids,
+            labels=labels,
+            parents=parents,
+            values=values,
+            branchvalues="total",
+        )
+    )
+    fig.update_layout(title=title)
+    return fig
@@ -5,7 +5,9 @@ from application.highlight_service import highlight_service
 import pandas as pd
 
 from presentation.components.navbar import get_header, get_menu
+from presentation.components.treemap_components import make_treemap
 from services.transaction_service import (
+    get_expense_treemap,
     get_transactions,
 )
 from utils.util_methods import get_current_day_and_month
@@ -23,7 +25,9 @@ def create_layout(app):
     category_anchoi_team_analysis_panel = finance.category_analysis("team")
     category_muasam_analysis_panel = finance.category_analysis("shopping")
     highest_expense_chart_panel = finance.create_highest_expense_by_account_chart(4)
-    expense_category_tree_map = finance.expense_category_tree_map()
+    expense_category_tree_map = make_treemap(
+        get_expense_treemap(params), "Phân bố chi phí theo nhóm"
+    )
     expense_category_column_shorter = finance.expense_category_column_shorter()
 
     return html.Div(
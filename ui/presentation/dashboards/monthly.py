@@ -1,18 +1,17 @@
 import calendar
 from application.monthly_service import monthly_service
 from presentation.components.navbar import get_header, get_menu
+from presentation.components.treemap_components import make_treemap
 
 from presentation.components.table_components import (
     make_dash_table_dict,
     make_dash_table_list,
 )
 from services.transaction_service import (
-    get_income_expenditure,
+    get_dashboard,
+    get_expense_treemap,
     get_invest_transactions,
-    get_overview,
     get_saving_transactions,
-    get_summary,
-    get_balance_trends_month,
 )
 import pandas as pd
 from utils.util_methods import format_value, get_monthly_range
@@ -58,27 +57,23 @@ def create_layout(app, month=None):
         saving_df=pd.DataFrame(saving_transactions),
         investigate_df=pd.DataFrame(invest_transactions),
     )
-    # Logic in API
-    overview = get_overview(params)
-    summary = get_summary(params)
-    latest_transaction = get_transactions(params, limit=4, sort_by="transaction_date")
-    balance_data = get_balance_trends_month(
-        year=year, start_day=start_day, end_day=end_day
-    )
+    # Logic in API: every section for the range in one request
+    dashboard = get_dashboard(
+        params, top_n=4, categories=("chi phí", "food", "shopping")
+    ) or {}
+    overview = dashboard.get("overview")
+    summary = dashboard.get("summary")
+    latest_transaction = dashboard.get("latest")
+    balance_data = dashboard.get("balance_trends")
     balance_trends_chart = balance_trends(balance_data) if balance_data else None
 
-    top_4_highest_transaction = get_transactions(params, limit=4, sort_by="debit")
-    detailed_debit_per_category_chiphi = get_transactions(
-        params, limit=4, sort_by="debit", search="chi phí"
-    )
-    detailed_debit_per_category_utilities = get_transactions(
-        params, limit=4, sort_by="debit", search="food"
-    )
-    detailed_debit_per_category_shopping = get_transactions(
-        params, limit=4, sort_by="debit", search="shopping"
-    )
+    top_4_highest_transaction = dashboard.get("top_debits")
+    category_top = dashboard.get("category_top", {})
+    detailed_debit_per_category_chiphi = category_top.get("chi phí")
+    detailed_debit_per_category_utilities = category_top.get("food")
+    detailed_debit_per_category_shopping = category_top.get("shopping")
 
-    income_expenditure_data = get_income_expenditure(params)
+    income_expenditure_data = dashboard.get("income_expenditure")
     income_expenditure_chart_data = (
         income_expenditure_chart(income_expenditure_data)
         if income_expenditure_data
@@ -87,7 +82,9 @@ def create_layout(app, month=None):
     # Logic in UI
     transaction_distribution = monthlyDashboard.transaction_distribution()
     detailed_transaction_analysis = monthlyDashboard.detailed_transaction_analysis()
-    expense_category_tree_map = monthlyDashboard.expense_category_tree_map()
+    expense_category_tree_map = make_treemap(
+        get_expense_treemap(params), "Phân bố chi phí theo nhóm"
+    )
 
     # Build layout
     return html.Div(
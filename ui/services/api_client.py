@@ -2,7 +2,8 @@ import requests
 
 
 class APIClient:
-    BASE_URL = "http://127.0.0.1:8000/api/v1/transactions"
+    API_URL = "http://127.0.0.1:8000/api/v1"
+    BASE_URL = f"{API_URL}/transactions"
 
     @staticmethod
     def fetch_data(endpoint, params={}):
@@ -15,3 +16,15 @@ class APIClient:
         except requests.RequestException as e:
             print(f"API Error [{endpoint}]: {e}")
             return None  # Return None if API fails
+
+    @staticmethod
+    def post_data(endpoint, payload):
+        """POST a JSON payload to an API endpoint outside /transactions"""
+        url = f"{APIClient.API_URL}/{endpoint}"
+        try:
+            response = requests.post(url, json=payload)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            print(f"API Error [{endpoint}]: {e}")
+            return None  # Return None if API fails
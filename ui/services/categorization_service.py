@@ -0,0 +1,18 @@
+from services.api_client import APIClient
+
+# Label used when the API cannot be reached (the rules' default category)
+FALLBACK_CATEGORY = "Others"
+
+
+def categorize_records(records):
+    """Expense category of each {description, counter_account, category} record.
+
+    The API owns the category rules (and reloads them when they change), so
+    the UI asks it instead of keeping its own copy of the rule engine.
+    """
+    if not records:
+        return []
+    categorized = APIClient.post_data("categorize", records)
+    if categorized is None:
+        return [FALLBACK_CATEGORY] * len(records)
+    return [record.get("expense_category", FALLBACK_CATEGORY) for record in categorized]
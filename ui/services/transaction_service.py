@@ -17,6 +17,19 @@ def get_income_expenditure(params):
     return APIClient.fetch_data("income-expenditure", params)
 
 
+def get_dashboard(params, sections=None, top_n=4, categories=()):
+    """Fetch several dashboard sections for one date range in a single request."""
+    dashboard_params = {**params, "top_n": top_n, "category": list(categories)}
+    if sections:
+        dashboard_params["sections"] = ",".join(sections)
+    return APIClient.fetch_data("dashboard", dashboard_params)
+
+
+def get_expense_treemap(params, top_n=10):
+    """Fetch debits grouped as expense category -> counter account."""
+    return APIClient.fetch_data("expense-treemap", {**params, "top_n": top_n})
+
+
 def get_transactions(
     params,
     limit=10,
@@ -61,13 +74,14 @@ def get_invest_transactions(
     return APIClient.fetch_data("investment", transaction_params)
 
 
-def get_balance_trends(year):
-    """Fetches balance trends for a given year."""
+def get_balance_trends(year, max_points=500):
+    """Fetches balance trends for a given year, downsampled to at most max_points."""
     params = {
         "start_date": "2023-01-01",
         "end_date": f"{year}-12-31",
         "limit": -1,
         "offset": 0,
+        "max_points": max_points,
     }
     return APIClient.fetch_data("balance-trends", params)
 